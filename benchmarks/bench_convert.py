@@ -0,0 +1,51 @@
+"""
+Benchmark of format conversion to 44.1 kHz, mono, 16-bit on 48 kHz stereo 24-bit input.
+
+Compares the NumPy Converter against the chained pydub set_frame_rate, set_channels and set_sample_width calls.
+
+Usage: python -m benchmarks.bench_convert
+"""
+import os
+import tempfile
+import timeit
+from pydub.audio_segment import AudioSegment
+from polyend_tracker_pti_creator.utils.audio.convert import Converter
+from polyend_tracker_pti_creator.utils.audio.wave_file import WaveFile
+from tests.corpus import write_wave
+
+SECONDS = 10
+BLOCK_FRAMES = 65536
+
+
+def pydub_convert(wave: WaveFile) -> bytes:
+    audio_segment = AudioSegment(
+        data=bytes(wave.data),
+        sample_width=wave.sample_width,
+        frame_rate=wave.frame_rate,
+        channels=wave.channels,
+    )
+    return audio_segment.set_frame_rate(44100).set_channels(1).set_sample_width(2).raw_data
+
+
+def numpy_convert(wave: WaveFile) -> bytes:
+    converter = Converter(wave.frame_rate, wave.channels, wave.sample_width)
+    block_length = BLOCK_FRAMES * wave.block_align
+    return b''.join([
+        converter.convert(wave.data[offset:offset + block_length])
+        for offset in range(0, len(wave.data), block_length)
+    ])
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_wave(os.path.join(directory, 'source.wav'), SECONDS, frame_rate=48000, channels=2, sample_width=3)
+        wave = WaveFile.from_file(path)
+        assert pydub_convert(wave) == numpy_convert(wave)
+        print(f"{f'{SECONDS} s 48k stereo 24-bit':<24}{'seconds':>12}{'x realtime':>12}")
+        for name, function in [('pydub', pydub_convert), ('numpy', numpy_convert)]:
+            seconds = min(timeit.repeat(lambda function=function: function(wave), number=1, repeat=3))
+            print(f"{name:<24}{seconds:>12.4f}{SECONDS / seconds:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
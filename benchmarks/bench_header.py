@@ -0,0 +1,49 @@
+"""
+Micro-benchmark of .pti header construction.
+
+Compares the compiled header codec against the previous approach of deep-copying the header definition and
+rebuilding the struct format and value tuple for every instrument.
+
+Usage: python -m benchmarks.bench_header
+"""
+import struct
+import timeit
+from copy import deepcopy
+from polyend_tracker_pti_creator.utils.pti.constants import PTI_HEADER_DEFINITION
+from polyend_tracker_pti_creator.utils.pti.header import Header
+
+SETTINGS = {
+    'sample_length': 21344,
+    'instrument_name': 'benchmark',
+    'sample_playback': 1,
+    'loop_start': 13968,
+    'loop_end': 65532,
+}
+NUMBER = 10000
+
+
+def deepcopy_header_bytes(settings: dict) -> bytearray:
+    definition = deepcopy(PTI_HEADER_DEFINITION)
+    for key, value in settings.items():
+        if isinstance(value, str):
+            value = Header.encode_string(value)
+        definition[key]['value'] = value
+    header_format = '<' + ''.join([value['type'] for value in definition.values()])
+    data = tuple([value['value'] for value in definition.values()])
+    return bytearray(struct.pack(header_format, *data))
+
+
+def compiled_header_bytes(settings: dict) -> bytearray:
+    return Header(settings).data_bytes
+
+
+def main() -> None:
+    assert deepcopy_header_bytes(SETTINGS) == compiled_header_bytes(SETTINGS)
+    print(f"{'header construction':<24}{'per header':>14}{f'{NUMBER} headers':>16}")
+    for name, function in [('deepcopy', deepcopy_header_bytes), ('compiled', compiled_header_bytes)]:
+        seconds = min(timeit.repeat(lambda function=function: function(SETTINGS), number=NUMBER, repeat=5))
+        print(f"{name:<24}{seconds / NUMBER * 1e6:>11.2f} us{seconds:>14.4f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark of merge mode concatenation at 48 slices.
+
+Compares PTI.merge_audio, which fills one preallocated buffer, against appending each slice to an AudioSegment,
+which copies the accumulated audio on every slice.
+
+Usage: python -m benchmarks.bench_merge
+"""
+import os
+import tempfile
+import timeit
+from pydub.audio_segment import AudioSegment
+from polyend_tracker_pti_creator.utils.audio.audio import Audio
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+from benchmarks.corpus import write_corpus
+
+SLICES = 48
+SECONDS = 0.6
+
+
+def appended_merge(paths: list) -> AudioSegment:
+    combined = AudioSegment.empty()
+    for path in paths:
+        combined += Audio(path).audio_segment
+    return combined
+
+
+def preallocated_merge(directory: str, paths: list) -> AudioSegment:
+    settings = {
+        'files': [
+            {
+                'source_path': directory,
+                'source_file_name': os.path.splitext(os.path.basename(path))[0],
+                'source_extension': '.wav',
+            } for path in paths
+        ],
+        'mode': 'merge',
+        'playback': 'beat-slice',
+    }
+    return PTI(settings).files[0]['audio'].audio_segment
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, SLICES, SECONDS)
+        assert appended_merge(paths).raw_data == preallocated_merge(directory, paths).raw_data
+        print(f"{f'merge of {SLICES} slices':<24}{'seconds':>12}")
+        for name, function in [
+            ('appended', lambda: appended_merge(paths)),
+            ('preallocated', lambda: preallocated_merge(directory, paths)),
+        ]:
+            seconds = min(timeit.repeat(function, number=3, repeat=3)) / 3
+            print(f"{name:<24}{seconds:>12.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark of the resample quality tiers for 48k, 88.2k and 96k sources.
+
+For each tier and source rate this reports:
+- throughput in seconds of audio converted per CPU-second, through the full Converter on stereo 24-bit input.
+- stopband attenuation: the largest kernel response at or above the 22.05 kHz output Nyquist frequency.
+- the -3 dB frequency of the kernel.
+
+Usage: python -m benchmarks.bench_resample
+"""
+import time
+import numpy as np
+from polyend_tracker_pti_creator.utils.audio.convert import Converter
+from polyend_tracker_pti_creator.utils.audio.resample import RESAMPLE_QUALITIES, kaiser_sinc
+
+FRAME_RATES = [48000, 88200, 96000]
+SECONDS = 10
+BLOCK_FRAMES = 65536
+OVERSAMPLING = 64
+FFT_LENGTH = 2 ** 20
+
+
+def kernel(quality: str, frame_rate: int) -> np.ndarray:
+    """
+    The interpolation kernel sampled OVERSAMPLING times per input sample.
+    'fast' interpolates linearly, which is a triangle one input sample either side.
+    """
+    parameters = RESAMPLE_QUALITIES[quality]
+    ratio = 44100 / frame_rate
+    half_width = 1 if parameters is None else parameters['zero_crossings'] / (parameters['cutoff'] * min(1, ratio))
+    offsets = np.arange(-int(half_width * OVERSAMPLING), int(half_width * OVERSAMPLING) + 1) / OVERSAMPLING
+    if parameters is None:
+        return np.clip(1 - np.abs(offsets), 0, None)
+    return kaiser_sinc(offsets, ratio=ratio, **parameters)
+
+
+def response(quality: str, frame_rate: int) -> tuple:
+    magnitude = np.abs(np.fft.rfft(kernel(quality, frame_rate), FFT_LENGTH))
+    magnitude = 20 * np.log10(np.maximum(magnitude / magnitude[0], 1e-12))
+    frequencies = np.fft.rfftfreq(FFT_LENGTH, 1 / OVERSAMPLING) * frame_rate
+    stopband = magnitude[frequencies >= 22050].max()
+    cutoff = frequencies[np.argmax(magnitude < -3)]
+    return stopband, cutoff
+
+
+def throughput(quality: str, frame_rate: int) -> float:
+    frames = SECONDS * frame_rate
+    data = np.random.default_rng(0).integers(0, 256, frames * 2 * 3, dtype=np.uint8).tobytes()
+    converter = Converter(frame_rate, 2, 3, quality)
+    block_length = BLOCK_FRAMES * 2 * 3
+    start = time.process_time()
+    for offset in range(0, len(data), block_length):
+        converter.convert(data[offset:offset + block_length])
+    converter.flush()
+    return SECONDS / (time.process_time() - start)
+
+
+def main() -> None:
+    print(f"{'quality':<10}{'source':>8}{'audio s/CPU s':>15}{'stopband dB':>13}{'-3 dB Hz':>10}")
+    for quality in RESAMPLE_QUALITIES:
+        for frame_rate in FRAME_RATES:
+            stopband, cutoff = response(quality, frame_rate)
+            print(
+                f"{quality:<10}{frame_rate:>8}{throughput(quality, frame_rate):>15.0f}"
+                f"{stopband:>13.1f}{cutoff:>10.0f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
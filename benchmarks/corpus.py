@@ -0,0 +1,15 @@
+"""
+Synthetic wave corpora for the benchmarks, generated locally so no sample library is needed.
+"""
+import os
+from tests.corpus import write_wave
+
+
+def write_corpus(directory: str, count: int, seconds: float, **wave_format) -> list:
+    """
+    Writes count wave files named 001.wav, 002.wav, ... into directory and returns their paths.
+    """
+    return [
+        write_wave(os.path.join(directory, f'{index + 1:03}.wav'), seconds, **wave_format)
+        for index in range(count)
+    ]
@@ -0,0 +1,237 @@
+"""
+Benchmark suite covering header packing, wave and AIFF ingestion, merge, batch conversion and CLI startup.
+
+Each case runs against a synthetic corpus written to a temporary directory and reports:
+- seconds: best wall time of REPEAT runs.
+- throughput: items per second, in the unit named by the case.
+- peak memory: the largest Python heap allocation seen by tracemalloc during one extra run, NumPy buffers included.
+  Memory-mapped source files are not counted.
+
+Results can be saved as JSON and compared with an earlier run, so regressions show up as numbers.
+
+Usage: python -m benchmarks.suite [--json results.json] [--compare baseline.json] [--case name ...]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+from polyend_tracker_pti_creator.utils.audio.audio import Audio
+from polyend_tracker_pti_creator.utils.pti.header import Header
+from polyend_tracker_pti_creator.utils.pti.pipeline import Pipeline
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+from benchmarks.corpus import write_corpus
+from tests.corpus import write_aiff
+
+REPEAT = 3
+HEADER_COUNT = 10000
+LOOP_FILES = 200
+INGEST_FILES = 8
+INGEST_SECONDS = 5
+MERGE_SLICES = 48
+MERGE_SECONDS = 0.6
+BATCH_FILES = 16
+BATCH_SECONDS = 2
+STARTUP_RUNS = 10
+# pet-pti-creator invocations that return before converting anything: help and a validation error.
+STARTUP_ARGS = [['--help'], ['--source', 'missing.wav']]
+STARTUP_SCRIPT = "import sys; sys.argv[0] = 'pet-pti-creator'; " \
+                 "from polyend_tracker_pti_creator.creator import main; main()"
+HEADER_SETTINGS = {
+    'sample_length': 21344,
+    'instrument_name': 'benchmark',
+    'sample_playback': 1,
+    'loop_start': 13968,
+    'loop_end': 65532,
+}
+
+
+class Case(NamedTuple):
+    name: str
+    unit: str
+    items: float
+    run: Callable[[], object]
+
+
+def file_settings(directory: str, paths: List[str], destination: str) -> List[Dict]:
+    return [
+        {
+            'source_path': directory,
+            'source_file_name': os.path.splitext(os.path.basename(path))[0],
+            'source_extension': '.wav',
+            'destination_path': destination,
+            'destination_file_name': os.path.splitext(os.path.basename(path))[0],
+            'destination_extension': '.pti',
+            'instrument_name': 'benchmark',
+        } for path in paths
+    ]
+
+
+def header_case(_directory: str) -> Case:
+    def run() -> None:
+        for _ in range(HEADER_COUNT):
+            Header(HEADER_SETTINGS).data_bytes  # pylint: disable=expression-not-assigned
+    return Case('header', 'headers', HEADER_COUNT, run)
+
+
+def loop_points_case(directory: str) -> Case:
+    paths = write_corpus(directory, LOOP_FILES, 1, loop=(1000, 40000))
+
+    def run() -> None:
+        for path in paths:
+            Audio(path).loop_points  # pylint: disable=expression-not-assigned
+    return Case('loop_points', 'files', LOOP_FILES, run)
+
+
+def audio_segment_case(directory: str) -> Case:
+    paths = write_corpus(directory, INGEST_FILES, INGEST_SECONDS, frame_rate=48000, channels=2, sample_width=3)
+
+    def run() -> None:
+        for path in paths:
+            Audio(path).audio_segment  # pylint: disable=expression-not-assigned
+    return Case('audio_segment', 'audio s', INGEST_FILES * INGEST_SECONDS, run)
+
+
+def aiff_case(directory: str) -> Case:
+    paths = [
+        write_aiff(os.path.join(directory, f'{index + 1:03}.aif'), INGEST_SECONDS, 48000, 2, 3)
+        for index in range(INGEST_FILES)
+    ]
+
+    def run() -> None:
+        for path in paths:
+            Audio(path).pcm  # pylint: disable=expression-not-assigned
+    return Case('aiff', 'audio s', INGEST_FILES * INGEST_SECONDS, run)
+
+
+def merge_audio_case(directory: str) -> Case:
+    paths = write_corpus(directory, MERGE_SLICES, MERGE_SECONDS)
+    settings = {
+        'files': file_settings(directory, paths, directory),
+        'mode': 'merge',
+        'playback': 'beat-slice',
+    }
+    return Case('merge_audio', 'slices', MERGE_SLICES, lambda: PTI(settings))
+
+
+def batch_settings(directory: str) -> Dict:
+    paths = write_corpus(directory, BATCH_FILES, BATCH_SECONDS, frame_rate=48000, channels=2)
+    destination = os.path.join(directory, 'out')
+    os.mkdir(destination)
+    return {
+        'files': file_settings(directory, paths, destination),
+        'mode': 'normal',
+        'playback': 'dynamic',
+        'jobs': 1,
+    }
+
+
+def create_case(directory: str) -> Case:
+    settings = batch_settings(directory)
+
+    def run() -> None:
+        PTI(settings).create()
+    return Case('create', 'files', BATCH_FILES, run)
+
+
+def create_overlapped_case(directory: str) -> Case:
+    settings = batch_settings(directory)
+
+    def run() -> None:
+        Pipeline(PTI(settings)).create()
+    return Case('create_overlapped', 'files', BATCH_FILES, run)
+
+
+def startup_case(_directory: str) -> Case:
+    """
+    Starts the CLI in a fresh interpreter each time, so import time is counted as build scripts see it.
+    """
+    def run() -> None:
+        for _ in range(STARTUP_RUNS):
+            for args in STARTUP_ARGS:
+                subprocess.run([sys.executable, '-c', STARTUP_SCRIPT] + args, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, check=False)
+    return Case('startup', 'starts', STARTUP_RUNS * len(STARTUP_ARGS), run)
+
+
+CASES = {
+    'header': header_case,
+    'loop_points': loop_points_case,
+    'audio_segment': audio_segment_case,
+    'aiff': aiff_case,
+    'merge_audio': merge_audio_case,
+    'create': create_case,
+    'create_overlapped': create_overlapped_case,
+    'startup': startup_case,
+}
+
+
+def measure(case: Case) -> Dict:
+    seconds = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        case.run()
+        seconds.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    best = min(seconds)
+    return {
+        'seconds': best,
+        'throughput': case.items / best,
+        'unit': case.unit,
+        'peak_memory': peak,
+    }
+
+
+def run_cases(names: List[str]) -> Dict[str, Dict]:
+    results = {}
+    for name in names:
+        with tempfile.TemporaryDirectory() as directory:
+            results[name] = measure(CASES[name](directory))
+    return results
+
+
+def print_results(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> None:
+    heading = f"{'case':<20}{'seconds':>10}{'throughput':>24}{'peak memory':>14}"
+    print(heading + f"{'vs baseline':>14}" if baseline else heading)
+    for name, result in results.items():
+        line = f"{name:<20}{result['seconds']:>10.4f}" \
+               f"{result['throughput']:>14.1f} {result['unit'] + '/s':<9}" \
+               f"{result['peak_memory'] / 2 ** 20:>11.2f} MB"
+        if name in baseline:
+            line += f"{result['seconds'] / baseline[name]['seconds'] - 1:>+14.1%}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--case", action="append", choices=list(CASES), help="case to run, repeatable. Default all.")
+    parser.add_argument("--json", help="write the results to this JSON file.")
+    parser.add_argument("--compare", help="JSON file from an earlier run to report the change in seconds against.")
+    args = parser.parse_args()
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+    results = run_cases(args.case or list(CASES))
+    print_results(results, baseline)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as results_file:
+            json.dump({
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'results': results,
+            }, results_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
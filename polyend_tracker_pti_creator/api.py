@@ -0,0 +1,102 @@
+"""
+Creates .pti instruments from wave or AIFF files in memory, without reading or writing files, for use as a library:
+
+    from polyend_tracker_pti_creator import api
+    pti_bytes = api.convert(wav_bytes, instrument_name='kick')
+"""
+import os
+from io import BytesIO
+from typing import BinaryIO, Dict, List, Optional, Union
+from polyend_tracker_pti_creator.utils.audio.audio import Audio, parse_source
+from polyend_tracker_pti_creator.utils.exceptions import (
+    CreatorPlaybackInvalidException,
+    CreatorResampleQualityInvalidException,
+)
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+from polyend_tracker_pti_creator.utils.settings import PLAYBACK_TYPES, RESAMPLE_QUALITIES, clean_instrument_name
+
+# A wave file held in memory, a readable binary stream, or a path.
+Source = Union[bytes, bytearray, memoryview, BinaryIO, str, os.PathLike]
+
+
+def convert(
+        source: Source,
+        instrument_name: str = '',
+        playback: str = 'dynamic',
+        resample_quality: str = 'fast',
+        destination: Optional[BinaryIO] = None,
+        name: str = 'memory',
+) -> Optional[bytes]:
+    """
+    Converts a single wave file to a .pti.
+    Args:
+        source: The wave file as bytes or a buffer, a readable binary stream, or a path.
+        instrument_name (str): Name shown on the Tracker. Characters it cannot display are removed.
+        playback (str): One of PLAYBACK_TYPES. dynamic is forward-loop if the source has a loop, else one-shot.
+        resample_quality (str): One of RESAMPLE_QUALITIES.
+        destination: Writable binary stream to write the .pti to. When not given the .pti is returned as bytes.
+        name (str): Names the source in error messages.
+    """
+    check_options(playback, resample_quality)
+    file = PTI.load_audio(memory_file(name, instrument_name), open_audio(source, resample_quality), playback)
+    return write(file, destination)
+
+
+def merge(
+        sources: List[Source],
+        instrument_name: str = '',
+        playback: str = 'beat-slice',
+        resample_quality: str = 'fast',
+        destination: Optional[BinaryIO] = None,
+        name: str = 'memory',
+) -> Optional[bytes]:
+    """
+    Merges up to 48 wave files into a single sliced .pti, one slice per source in the order given.
+    Takes the same arguments as convert, with a list of sources.
+    """
+    check_options(playback, resample_quality)
+    file = memory_file(name, instrument_name)
+    file['audio'], file['slice_points'] = PTI.merge([open_audio(source, resample_quality) for source in sources])
+    file['playback'] = playback
+    return write(file, destination)
+
+
+def check_options(playback: str, resample_quality: str) -> None:
+    if playback not in PLAYBACK_TYPES:
+        raise CreatorPlaybackInvalidException(
+            "Error! Gave an invalid playback type. Valid values are 'one-shot', 'forward-loop', 'backward-loop', "
+            "'ping-pong-loop', 'slice', 'beat-slice', 'wavetable', 'granular', and 'dynamic'"
+        )
+    if resample_quality not in RESAMPLE_QUALITIES:
+        raise CreatorResampleQualityInvalidException(
+            "Error! Gave an invalid resample quality. Valid values are 'fast', 'balanced' and 'best'."
+        )
+
+
+def memory_file(name: str, instrument_name: str) -> Dict:
+    """
+    The file dict PTI works with, for a source and destination that are not files.
+    """
+    return {
+        'source_path': '',
+        'source_file_name': name,
+        'source_extension': '',
+        'instrument_name': clean_instrument_name(instrument_name),
+    }
+
+
+def open_audio(source: Source, resample_quality: str) -> Audio:
+    if isinstance(source, (str, os.PathLike)):
+        return Audio(os.fspath(source), resample_quality)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return Audio.from_wave(parse_source(source), resample_quality)
+    return Audio.from_wave(parse_source(source.read()), resample_quality)
+
+
+def write(file: Dict, destination: Optional[BinaryIO]) -> Optional[bytes]:
+    if destination is not None:
+        PTI.write_stream(file, destination)
+        return None
+    stream = BytesIO()
+    PTI.write_stream(file, stream)
+    return stream.getvalue()
@@ -1,15 +1,76 @@
+# Only argument parsing and settings validation are imported up front. The audio stack (pydub, NumPy and the .pti
+# header definition) and the watcher are imported once there is something to convert or watch, so --help and
+# invalid arguments return without loading them.
+from polyend_tracker_pti_creator.utils import profiling
 from polyend_tracker_pti_creator.utils.args import parse_args
+from polyend_tracker_pti_creator.utils.discovery import FFMPEG_EXTENSIONS, SOURCE_EXTENSIONS
+from polyend_tracker_pti_creator.utils.exceptions import CreatorNoSourceWavFilesException
 from polyend_tracker_pti_creator.utils.settings import Settings
-from polyend_tracker_pti_creator.utils.pti.pti import PTI
 
 
 def main():
     args = parse_args()
+    if args.profile:
+        profiling.enable()
+    if args.watch:
+        watch(args)
+        return
     settings = Settings(args)
     create(settings.settings)
 
 
 def create(settings):
+    # pylint: disable=import-outside-toplevel
+    from polyend_tracker_pti_creator.utils.pti.pti import PTI
+    from polyend_tracker_pti_creator.utils.pti.pipeline import Pipeline
     pti = PTI(settings)
-    pti.create()
-    print("Success! new pti file(s) have been saved to " + settings['files'][0]['destination_path'] + ".")
+    if settings.get('overlapped') and pti.mode != 'merge':
+        Pipeline(pti).create()
+    else:
+        pti.create()
+    if pti.skipped:
+        print(f"Skipped {pti.skipped} up to date pti file(s).")
+    print("Success! new pti file(s) have been saved to " + settings['destination'] + ".")
+    if settings.get('profile'):
+        profiler = profiling.disable()
+        if profiler is not None:
+            profiler.save(settings['profile'])
+            print(profiler.summary())
+            print("Timing report saved to " + settings['profile'] + ".")
+
+
+def watch(args):
+    """
+    Converts the source tree, then again after each burst of changes to it. Each run lists the tree afresh so
+    files are named as a single run would name them, and skips the files already up to date.
+    """
+    # pylint: disable=import-outside-toplevel
+    from polyend_tracker_pti_creator.utils.watch import SETTLE_SECONDS, bursts, open_watcher
+    args.incremental = True
+    try:
+        Settings(args)
+    except CreatorNoSourceWavFilesException:
+        # An empty source directory is watched for files to land in it.
+        pass
+    watcher = open_watcher(
+        args.source, bool(args.recursive), SOURCE_EXTENSIONS + FFMPEG_EXTENSIONS if args.ffmpeg else SOURCE_EXTENSIONS
+    )
+    print(f"Watching {args.source} for .wav files ({watcher.name}). Press Ctrl+C to stop.")
+    try:
+        convert(args)
+        for changed in bursts(watcher, args.settle or SETTLE_SECONDS):
+            print(f"{len(changed)} .wav file(s) changed.")
+            convert(args)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def convert(args):
+    try:
+        create(Settings(args).settings)
+    except CreatorNoSourceWavFilesException:
+        pass
+    except Exception as exception:  # pylint: disable=broad-except
+        print(exception)
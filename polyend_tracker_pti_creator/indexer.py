@@ -0,0 +1,30 @@
+from polyend_tracker_pti_creator.utils.args import parse_index_args
+from polyend_tracker_pti_creator.utils.index import Index
+
+
+def main():
+    args = parse_index_args()
+    with Index(args.database) as index:
+        if args.command == 'update':
+            update(index, args.path)
+        else:
+            query(index, args)
+
+
+def update(index, path):
+    result = index.update(path)
+    for invalid_path in result.invalid:
+        print("Skipped invalid pti file " + invalid_path + ".")
+    print(f"Indexed {path}: {result.added} added, {result.updated} updated, {result.unchanged} unchanged, "
+          f"{result.removed} removed.")
+
+
+def query(index, args):
+    for row in index.query(
+            playback=args.playback,
+            min_seconds=args.min_seconds,
+            max_seconds=args.max_seconds,
+            name=args.instrument_name,
+            sha256=args.sha256,
+    ):
+        print(f"{row['path']}\t{row['instrument_name']}\t{row['playback']}\t{row['seconds']:.3f}s")
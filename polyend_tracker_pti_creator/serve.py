@@ -0,0 +1,17 @@
+from polyend_tracker_pti_creator.utils.args import parse_serve_args
+from polyend_tracker_pti_creator.utils.settings import parse_jobs
+
+
+def main():
+    args = parse_serve_args()
+    jobs = parse_jobs(args.jobs)
+    # The server imports the audio stack, so --help and invalid arguments return without loading it.
+    from polyend_tracker_pti_creator.utils.server import Server  # pylint: disable=import-outside-toplevel
+    server = Server((args.host, args.port), jobs, args.max_requests, args.max_upload_mb * 1024 * 1024)
+    print(f"Serving .pti conversion on http://{args.host}:{server.server_port}/convert with {jobs} worker(s).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -39,4 +39,117 @@ def parse_args() -> argparse.Namespace:
         help="destination file name - optional. Defaults to first file-name specified in destination parameter, "
              "then original source file name if a file name not specified in destination parameter."
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="number of files to convert in parallel in normal mode - optional. Defaults to the number of CPUs."
+    )
+    parser.add_argument(
+        "-rq",
+        "--resample-quality",
+        help="resampling quality for sources not at 44.1 kHz - optional. Possible values are fast, balanced and best. "
+             "Defaults to fast. 'fast' is linear interpolation, 'balanced' and 'best' are windowed-sinc filters "
+             "with about 80 dB and 120 dB of stopband attenuation."
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="skip sources whose .pti is up to date - optional. Keeps a .pti-manifest.json of source content hashes "
+             "and settings in each destination directory and only converts new or changed sources."
+    )
+    parser.add_argument(
+        "--overlapped",
+        action="store_true",
+        help="read, convert and write files of a batch at the same time in one process - optional. For single "
+             "core machines or slow drives such as SD cards. Used instead of --jobs."
+    )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="also convert .wav files in subdirectories of the source directory - optional. In normal mode the "
+             "subdirectory structure is recreated under the destination directory."
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        help="only convert source files matching this glob, such as 'kick*.wav' or 'drums/*' - optional, repeatable. "
+             "Globs containing '/' match the path relative to the source directory, others match the file name."
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        help="skip source files and subdirectories matching this glob - optional, repeatable. "
+             "Matched the same way as --include."
+    )
+    parser.add_argument(
+        "--profile",
+        help="JSON file to write a timing report to - optional. Records wall and CPU time of discovery, parsing, "
+             "conversion, header packing and writing for every file, and prints a summary table."
+    )
+    parser.add_argument(
+        "--ffmpeg",
+        action="store_true",
+        help="also convert .flac, .mp3 and .ogg files, decoded by ffmpeg - optional. Each ffmpeg process decodes a "
+             "batch of up to 16 files, with one process per job, rather than starting a process for every file."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and convert new or changed .wav files as they land in the source directory - optional. "
+             "Implies --incremental. Uses inotify where available, otherwise polls the source directory."
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        help="seconds without changes before a burst of new or changed files is converted in --watch mode "
+             "- optional. Defaults to 1."
+    )
+    return parser.parse_args()
+
+
+def parse_index_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Index a library of .pti files and search it.")
+    parser.add_argument(
+        "-db",
+        "--database",
+        default="pti-index.db",
+        help="SQLite index file - optional. Defaults to pti-index.db in the current directory."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    update = commands.add_parser(
+        "update",
+        help="add new and changed .pti files under a directory to the index, and remove files no longer there."
+    )
+    update.add_argument("path", help="directory path of .pti files, searched recursively.")
+    query = commands.add_parser("query", help="list indexed .pti files matching every filter given.")
+    query.add_argument("-p", "--playback", help="playback mode, such as beat-slice.")
+    query.add_argument("--min-seconds", type=float, help="shortest sample length in seconds.")
+    query.add_argument("--max-seconds", type=float, help="longest sample length in seconds.")
+    query.add_argument("-in", "--instrument-name", help="glob the instrument name must match, such as 'kick*'.")
+    query.add_argument("--sha256", help="content hash, to find copies of the same instrument.")
+    return parser.parse_args()
+
+
+def parse_serve_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve .pti conversion over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on - optional. Defaults to 127.0.0.1.")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on - optional. Defaults to 8000.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="number of worker processes converting files - optional. Defaults to the number of CPUs."
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        help="requests converted or waiting for a worker at once - optional. Further requests are answered with "
+             "503 until one finishes. Defaults to twice the number of jobs."
+    )
+    parser.add_argument(
+        "--max-upload-mb",
+        type=int,
+        default=256,
+        help="largest request body accepted, in megabytes - optional. Defaults to 256."
+    )
     return parser.parse_args()
@@ -0,0 +1,213 @@
+from __future__ import annotations
+import mmap
+import os
+from struct import unpack_from
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+from wave_chunk_parser.exceptions import (
+    InvalidHeaderException,
+)
+
+# AIFC compression types of uncompressed samples, with whether each is big-endian and floating point.
+COMPRESSION_TYPES: Dict[bytes, Tuple[bool, bool]] = {
+    b"NONE": (True, False),
+    b"twos": (True, False),
+    b"sowt": (False, False),
+    b"fl32": (True, True),
+    b"FL32": (True, True),
+    b"fl64": (True, True),
+    b"FL64": (True, True),
+}
+# INST loop play modes.
+NO_LOOPING = 0
+
+
+def extended_to_float(data: bytes) -> float:
+    """
+    Decodes the 80-bit IEEE 754 extended precision number AIFF stores the sample rate as.
+    """
+    exponent, mantissa = unpack_from(">HQ", data)
+    sign = -1 if exponent & 0x8000 else 1
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+
+class AiffFile:
+    """
+    An AIFF or AIFC file parsed in a single pass over its chunk headers, with the same interface as WaveFile.
+    Only the COMM, MARK and INST chunk bodies are read; the sound data chunk is located and memory-mapped on use.
+    Samples are big-endian, or little-endian for AIFC 'sowt', and 8-bit samples are signed.
+    """
+
+    HEADER_FORM = b"FORM"
+    FORM_TYPES = (b"AIFF", b"AIFC")
+    CHUNK_COMMON = b"COMM"
+    CHUNK_SOUND = b"SSND"
+    CHUNK_MARKER = b"MARK"
+    CHUNK_INSTRUMENT = b"INST"
+    OFFSET_CHUNKS = 12
+    LENGTH_CHUNK_HEADER = 8
+    LENGTH_COMMON = 18
+    LENGTH_SOUND_HEADER = 8
+    LENGTH_INSTRUMENT = 20
+    # The format pydub is asked to decode files this reader cannot, such as compressed AIFC.
+    FORMAT = "aiff"
+    signed_8bit = True
+
+    def __init__(self, buffer: Optional[bytes] = None) -> None:
+        """
+        Parses an AIFF or AIFC file held in memory or memory-mapped.
+        Args:
+            buffer (bytes): The complete file.
+        """
+        self.path: Optional[str] = None
+        self._buffer = memoryview(buffer) if buffer is not None else None
+        self.form_type = None
+        self.channels = None
+        self.frame_rate = None
+        self.bits_per_sample = None
+        self.block_align = None
+        self.compression_type = b"NONE"
+        self.big_endian = True
+        self.is_float = False
+        self.is_compressed = False
+        self.sample_frames = 0
+        self.data_offset = None
+        self.data_length = 0
+        self.markers: Dict[int, int] = {}
+        self.sustain_loop: Optional[Tuple[int, int, int]] = None
+        if self._buffer is not None:
+            self.parse(lambda offset, length: self._buffer[offset:offset + length], len(self._buffer))
+
+    @classmethod
+    def from_file(cls, path: str, preload: bool = False) -> AiffFile:
+        """
+        Reads the chunk headers by seeking past each chunk. With preload the whole file is read into memory instead.
+        """
+        with open(path, "rb") as file:
+            if preload:
+                return cls(file.read())
+            return cls.from_stream(file, path)
+
+    @classmethod
+    def from_stream(cls, stream: BinaryIO, path: Optional[str] = None) -> AiffFile:
+        aiff = cls()
+        aiff.path = path
+        size = stream.seek(0, os.SEEK_END)
+
+        def read(offset: int, length: int) -> bytes:
+            stream.seek(offset)
+            return stream.read(length)
+
+        aiff.parse(read, size)
+        return aiff
+
+    def parse(self, read: Callable[[int, int], bytes], size: int) -> None:
+        header = read(0, self.OFFSET_CHUNKS)
+        if len(header) < self.OFFSET_CHUNKS or header[0:4] != self.HEADER_FORM \
+                or bytes(header[8:12]) not in self.FORM_TYPES:
+            raise InvalidHeaderException("AIFF file must start with FORM and be of type AIFF or AIFC")
+        self.form_type = bytes(header[8:12])
+        offset = self.OFFSET_CHUNKS
+        while offset + self.LENGTH_CHUNK_HEADER <= size:
+            chunk_header = read(offset, self.LENGTH_CHUNK_HEADER)
+            name = bytes(chunk_header[0:4])
+            (length,) = unpack_from(">I", chunk_header, 4)
+            content = offset + self.LENGTH_CHUNK_HEADER
+            if name == self.CHUNK_COMMON:
+                self.parse_common(read(content, length))
+            elif name == self.CHUNK_SOUND:
+                (data_offset,) = unpack_from(">I", read(content, self.LENGTH_SOUND_HEADER))
+                self.data_offset = content + self.LENGTH_SOUND_HEADER + data_offset
+                self.data_length = max(0, min(length - self.LENGTH_SOUND_HEADER - data_offset,
+                                              size - self.data_offset))
+            elif name == self.CHUNK_MARKER:
+                self.parse_markers(read(content, length))
+            elif name == self.CHUNK_INSTRUMENT:
+                self.parse_instrument(read(content, self.LENGTH_INSTRUMENT))
+            offset = content + length + (length % 2)
+        if self.channels is None:
+            raise InvalidHeaderException("AIFF file is missing its COMM chunk")
+        if self.data_offset is None:
+            raise InvalidHeaderException("AIFF file is missing its SSND chunk")
+
+    def parse_common(self, content: bytes) -> None:
+        self.channels, self.sample_frames, self.bits_per_sample = unpack_from(">hIh", content)
+        self.frame_rate = round(extended_to_float(content[8:18]))
+        if self.form_type == b"AIFC" and len(content) >= self.LENGTH_COMMON + 4:
+            self.compression_type = bytes(content[18:22])
+        if self.compression_type in COMPRESSION_TYPES:
+            self.big_endian, self.is_float = COMPRESSION_TYPES[self.compression_type]
+        else:
+            self.is_compressed = True
+        self.block_align = self.channels * ((self.bits_per_sample + 7) // 8)
+
+    def parse_markers(self, content: bytes) -> None:
+        """
+        Marker positions in frames, keyed by marker id. Each marker ends with a padded Pascal string name.
+        """
+        (count,) = unpack_from(">H", content)
+        offset = 2
+        for _ in range(count):
+            if offset + 7 > len(content):
+                break
+            marker_id, position, name_length = unpack_from(">hIB", content, offset)
+            self.markers[marker_id] = position
+            offset += 7 + name_length + ((name_length + 1) % 2)
+
+    def parse_instrument(self, content: bytes) -> None:
+        """
+        The sustain loop: its play mode and the ids of the markers it begins and ends at.
+        """
+        if len(content) < self.LENGTH_INSTRUMENT:
+            return
+        self.sustain_loop = unpack_from(">hhh", content, 8)
+
+    @property
+    def loop(self) -> Optional[Tuple[int, int]]:
+        """
+        The sustain loop start and end frames, if the INST chunk has a loop between two markers.
+        """
+        if self.sustain_loop is None:
+            return None
+        play_mode, begin, end = self.sustain_loop
+        if play_mode == NO_LOOPING or begin not in self.markers or end not in self.markers:
+            return None
+        return self.markers[begin], self.markers[end]
+
+    @property
+    def buffer(self) -> memoryview:
+        """
+        The whole file, memory-mapped on first use when only the chunk headers were read.
+        """
+        if self._buffer is None:
+            if self.path is None:
+                raise ValueError("AIFF file was parsed from a stream; read its data from data_offset instead")
+            with open(self.path, "rb") as file:
+                self._buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        return self._buffer
+
+    @property
+    def is_pcm(self) -> bool:
+        """
+        Whether the samples are uncompressed 8, 16, 24 or 32-bit integers.
+        """
+        return not self.is_compressed and not self.is_float and self.sample_width in (1, 2, 3, 4)
+
+    @property
+    def sample_width(self) -> int:
+        """
+        Bytes per sample as stored. Samples with fewer bits, such as 20-bit, are left-justified in them.
+        """
+        return self.block_align // self.channels if self.channels else 0
+
+    @property
+    def frame_count(self) -> int:
+        if not self.block_align:
+            return 0
+        return min(self.data_length // self.block_align, self.sample_frames)
+
+    @property
+    def data(self) -> memoryview:
+        return self.buffer[self.data_offset:self.data_offset + self.frame_count * self.block_align]
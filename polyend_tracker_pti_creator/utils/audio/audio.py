@@ -1,46 +1,287 @@
-from typing import List
+from __future__ import annotations
+import io
+import os
+from typing import BinaryIO, Iterator, List, Optional, Union
 from pydub.audio_segment import AudioSegment
 from lazy_property import LazyProperty
-from polyend_tracker_pti_creator.utils.audio.wave_chunk_parser_extended import (
-    RiffChunkExtended,
-)
+from polyend_tracker_pti_creator.utils import profiling
+from polyend_tracker_pti_creator.utils.audio.aiff_file import AiffFile
+from polyend_tracker_pti_creator.utils.audio.convert import Converter
+from polyend_tracker_pti_creator.utils.audio.wave_file import WaveFile
+from polyend_tracker_pti_creator.utils.discovery import FFMPEG_EXTENSIONS
 from polyend_tracker_pti_creator.utils.exceptions import (
     FfmpegNotInstalledException,
 )
 
+NATIVE_FRAME_RATE = 44100
+NATIVE_CHANNELS = 1
+NATIVE_SAMPLE_WIDTH = 2
+BLOCK_FRAMES = 65536
+SourceFile = Union[WaveFile, AiffFile]
+
+
+def copy_file_range(source: BinaryIO, destination: BinaryIO, offset: int, length: int) -> int:
+    """
+    Copies a byte range of the source file to the current position of the destination file inside the kernel,
+    using os.copy_file_range or os.sendfile where the OS supports them.
+    Returns the number of bytes copied, which is less than length if neither is available.
+    """
+    destination.flush()
+    source_fd = source.fileno()
+    destination_fd = destination.fileno()
+    destination_offset = destination.tell()
+    copied = 0
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while copied < length:
+                count = os.copy_file_range(
+                    source_fd, destination_fd, length - copied, offset + copied, destination_offset + copied
+                )
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            pass
+    if copied < length and hasattr(os, 'sendfile'):
+        os.lseek(destination_fd, destination_offset + copied, os.SEEK_SET)
+        try:
+            while copied < length:
+                count = os.sendfile(destination_fd, source_fd, offset + copied, length - copied)
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            pass
+    destination.seek(destination_offset + copied)
+    return copied
+
+
+def parse_source(buffer: bytes) -> SourceFile:
+    """
+    Parses a wave or AIFF file held in memory, telling them apart by their first four bytes.
+    """
+    return AiffFile(buffer) if bytes(buffer[:4]) == AiffFile.HEADER_FORM else WaveFile(buffer)
+
+
+def has_fileno(stream: BinaryIO) -> bool:
+    """
+    Whether the stream is backed by a file descriptor, unlike io.BytesIO.
+    """
+    try:
+        stream.fileno()
+    except (AttributeError, OSError):
+        return False
+    return True
+
 
 class Audio:
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, resample_quality: str = 'fast', preload: bool = False) -> None:
+        """
+        Args:
+            path (str): Source wave file.
+            resample_quality (str): One of RESAMPLE_QUALITIES.
+            preload (bool): Read the whole source into memory when it is opened rather than memory-mapping it, so
+                converting it does no further file I/O.
+        """
         self.path = path
+        self.resample_quality = resample_quality
+        self.preload = preload
+
+    @classmethod
+    def from_segment(cls, audio_segment: AudioSegment) -> Audio:
+        """
+        Wraps already decoded and converted audio, such as merged slices, which has no source file.
+        """
+        audio = cls(None)
+        audio._audio_segment = audio_segment
+        audio._wave = None
+        audio._is_native = False
+        return audio
+
+    @classmethod
+    def from_pcm(cls, pcm: bytes, path: Optional[str] = None) -> Audio:
+        """
+        Wraps 44.1 kHz, mono, 16-bit PCM already decoded from path, such as by ffmpeg.
+        """
+        audio = cls.from_segment(AudioSegment(
+            data=pcm,
+            sample_width=NATIVE_SAMPLE_WIDTH,
+            frame_rate=NATIVE_FRAME_RATE,
+            channels=NATIVE_CHANNELS,
+        ))
+        audio.path = path
+        return audio
+
+    @classmethod
+    def from_wave(cls, wave: SourceFile, resample_quality: str = 'fast') -> Audio:
+        """
+        Wraps a wave or AIFF file already parsed in memory, which has no source file.
+        """
+        audio = cls(None, resample_quality)
+        audio._wave = wave
+        return audio
+
+    @LazyProperty
+    def wave(self) -> SourceFile:
+        """
+        The parsed source file, a WaveFile or an AiffFile. None for formats only ffmpeg decodes.
+        """
+        with profiling.stage('parse', self.path):
+            with open(self.path, 'rb') as file:
+                magic = file.read(4)
+            if magic == AiffFile.HEADER_FORM:
+                return AiffFile.from_file(self.path, self.preload)
+            if magic != WaveFile.HEADER_RIFF and os.path.splitext(self.path)[1].lower() in FFMPEG_EXTENSIONS:
+                return None
+            return WaveFile.from_file(self.path, self.preload)
 
     @LazyProperty
     def loop_points(self) -> List[int]:
-        with open(self.path, "rb") as file:
-            try:
-                print(self.path)
-                frame_count = AudioSegment.from_file(self.path, format='wav').frame_count()
-                riff_chunk = RiffChunkExtended.from_file(file, user_chunks=[RiffChunkExtended.CHUNK_SAMPLE])
-                sample_chunk = None
-                for sc in riff_chunk.sub_chunks:
-                    if sc.get_name == RiffChunkExtended.CHUNK_SAMPLE:
-                        sample_chunk = sc
-                return [
-                    round((sample_chunk.first_loop_start / frame_count) * 65535),
-                    round((sample_chunk.first_loop_end / frame_count) * 65535)
-                ] if sample_chunk.number_of_sample_loops > 0 else [0, 0]
-            except AttributeError:
-                return [0, 0]
+        loop = self.wave.loop if self.wave is not None else None
+        if loop is None:
+            return [0, 0]
+        frame_count = self.wave.frame_count
+        return [
+            round((loop[0] / frame_count) * 65535),
+            round((loop[1] / frame_count) * 65535)
+        ]
+
+    @LazyProperty
+    def is_native(self) -> bool:
+        """
+        Whether the source PCM is already 44.1 kHz, mono and 16-bit and can be copied into the .pti unchanged.
+        """
+        return self.is_pcm \
+            and self.wave.is_pcm \
+            and not self.wave.big_endian \
+            and self.wave.frame_rate == NATIVE_FRAME_RATE \
+            and self.wave.channels == NATIVE_CHANNELS \
+            and self.wave.sample_width == NATIVE_SAMPLE_WIDTH
+
+    @LazyProperty
+    def is_pcm(self) -> bool:
+        """
+        Whether the source PCM can be converted block by block from the wave data chunk: integer samples of 8 to 32
+        bits or floating point samples of 32 or 64 bits, in plain or extensible wave files. Only other formats are
+        decoded by pydub, which needs ffmpeg.
+        """
+        return self.wave is not None and (self.wave.is_pcm or self.wave.is_float)
+
+    @LazyProperty
+    def frame_count(self) -> int:
+        """
+        Number of frames after conversion to 44.1 kHz, known before any PCM is converted.
+        """
+        if not self.is_pcm:
+            return int(self.audio_segment.frame_count())
+        return self.converter.frame_count(self.wave.frame_count)
+
+    @property
+    def converter(self) -> Converter:
+        """
+        A new converter from the source format, holding the resampler position for one pass over the PCM.
+        """
+        return Converter(
+            self.wave.frame_rate,
+            self.wave.channels,
+            self.wave.sample_width,
+            self.resample_quality,
+            self.wave.is_float,
+            self.wave.big_endian,
+            self.wave.signed_8bit,
+        )
+
+    @LazyProperty
+    def duration(self) -> int:
+        """
+        Length in milliseconds, rounded the same way as AudioSegment.
+        """
+        return round(1000 * (self.frame_count / NATIVE_FRAME_RATE))
+
+    @LazyProperty
+    def header_duration(self) -> int:
+        """
+        Length in milliseconds read from the fmt and data chunk headers, without reading or decoding any PCM.
+        Exact for PCM sources. For other wave formats it is the source length, which the converted length can
+        differ from by rounding only.
+        """
+        if self.wave is None or self.is_pcm or not self.wave.block_align or not self.wave.frame_rate:
+            return self.duration
+        return round(1000 * (self.wave.frame_count / self.wave.frame_rate))
+
+    def write_pcm(self, destination: BinaryIO) -> None:
+        """
+        Writes the converted PCM to the destination file one block at a time.
+        Native sources are copied straight from the data chunk without being decoded, inside the kernel when both
+        the source and the destination are seekable files.
+        """
+        if not self.is_native:
+            for block in self.iter_pcm():
+                destination.write(block)
+            return
+        if self.path is None or not has_fileno(destination) or not destination.seekable():
+            destination.write(self.wave.data)
+            return
+        length = self.wave.frame_count * self.wave.block_align
+        with open(self.path, "rb") as source:
+            copied = copy_file_range(source, destination, self.wave.data_offset, length)
+        if copied < length:
+            destination.write(self.wave.data[copied:])
+
+    @property
+    def pcm(self) -> bytes:
+        """
+        The whole converted PCM. Native sources are returned as stored.
+        """
+        if self.is_native:
+            return bytes(self.wave.data)
+        return b''.join(self.iter_pcm())
+
+    def iter_pcm(self, block_frames: int = BLOCK_FRAMES) -> Iterator[bytes]:
+        """
+        Yields the PCM as 44.1 kHz, mono, 16-bit blocks converted from at most block_frames source frames each,
+        so only one block is held in memory at a time.
+        """
+        if not self.is_pcm:
+            raw_data = memoryview(self.audio_segment.raw_data)
+            for offset in range(0, len(raw_data), block_frames * 2):
+                yield raw_data[offset:offset + block_frames * 2]
+            return
+        data = self.wave.data
+        block_length = block_frames * self.wave.block_align
+        converter = self.converter
+        for offset in range(0, len(data), block_length):
+            with profiling.stage('convert', self.path):
+                block = converter.convert(data[offset:offset + block_length])
+            yield block
+        with profiling.stage('convert', self.path):
+            block = converter.flush()
+        if block:
+            yield block
 
     @LazyProperty
     def audio_segment(self) -> AudioSegment:
+        if self.is_pcm:
+            return AudioSegment(
+                data=b''.join(self.iter_pcm()),
+                sample_width=NATIVE_SAMPLE_WIDTH,
+                frame_rate=NATIVE_FRAME_RATE,
+                channels=NATIVE_CHANNELS,
+            )
         try:
-            audio_segment = AudioSegment.from_file(self.path, format='wav')
-            if audio_segment.frame_rate != 44100:
-                audio_segment = audio_segment.set_frame_rate(44100)
-            if audio_segment.channels != 1:
-                audio_segment = audio_segment.set_channels(1)
-            if audio_segment.sample_width != 2:
-                audio_segment = audio_segment.set_sample_width(2)
+            with profiling.stage('convert', self.path):
+                source = self.path if self.path is not None else io.BytesIO(bytes(self.wave.buffer))
+                if self.wave is not None:
+                    source_format = self.wave.FORMAT
+                else:
+                    source_format = os.path.splitext(self.path)[1][1:].lower()
+                audio_segment = AudioSegment.from_file(source, format=source_format)
+                if audio_segment.frame_rate != 44100:
+                    audio_segment = audio_segment.set_frame_rate(44100)
+                if audio_segment.channels != 1:
+                    audio_segment = audio_segment.set_channels(1)
+                if audio_segment.sample_width != 2:
+                    audio_segment = audio_segment.set_sample_width(2)
             return audio_segment
         except FileNotFoundError as exception:
             if exception.filename == "ffprobe":
@@ -0,0 +1,156 @@
+from math import gcd
+import numpy as np
+from polyend_tracker_pti_creator.utils.audio.resample import (
+    RESAMPLE_QUALITIES,
+    SincResampler,
+)
+
+NATIVE_FRAME_RATE = 44100
+NATIVE_SAMPLE_WIDTH = 2
+
+
+class Converter:
+    """
+    Vectorized conversion of source PCM to 44.1 kHz, mono, 16-bit.
+    Resampling, downmix and bit depth change run as one NumPy pipeline per block. With the 'fast' resample quality
+    the arithmetic follows the pydub set_frame_rate, set_channels and set_sample_width chain (audioop ratecv, tomono
+    and lin2lin) so the output is identical to it. The other qualities downmix first, then resample the mono signal
+    with a windowed-sinc filter in floating point.
+    """
+
+    def __init__(
+            self,
+            frame_rate: int,
+            channels: int,
+            sample_width: int,
+            resample_quality: str = 'fast',
+            is_float: bool = False,
+            big_endian: bool = False,
+            signed_8bit: bool = False,
+    ) -> None:
+        """
+        Args:
+            frame_rate (int): Source frame rate.
+            channels (int): Source channel count.
+            sample_width (int): Source bytes per sample, 8-bit samples being unsigned as stored in wave files.
+            resample_quality (str): One of RESAMPLE_QUALITIES.
+            is_float (bool): Whether the samples are 32 or 64-bit floating point rather than integers.
+            big_endian (bool): Whether the samples are big-endian, as in AIFF files.
+            signed_8bit (bool): Whether 8-bit samples are signed, as in AIFF files, rather than unsigned.
+        """
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.is_float = is_float
+        self.byte_order = '>' if big_endian else '<'
+        self.signed_8bit = signed_8bit
+        # 24-bit samples are widened to 32-bit before conversion, as pydub does. Floating point samples are
+        # converted to 32-bit integers.
+        self.width = 4 if sample_width == 3 or is_float else sample_width
+        self.shift = 32 - 8 * self.width
+        divisor = gcd(frame_rate, NATIVE_FRAME_RATE)
+        self.input_rate = frame_rate // divisor
+        self.output_rate = NATIVE_FRAME_RATE // divisor
+        self.input_frames = 0
+        self.output_frames = 0
+        self.last_frame = np.zeros(channels, dtype=np.int64)
+        self.resampler = None
+        if frame_rate != NATIVE_FRAME_RATE and RESAMPLE_QUALITIES[resample_quality]:
+            self.resampler = SincResampler(frame_rate, NATIVE_FRAME_RATE, **RESAMPLE_QUALITIES[resample_quality])
+
+    def frame_count(self, input_frames: int) -> int:
+        """
+        Number of output frames produced from input_frames source frames.
+        """
+        if self.frame_rate == NATIVE_FRAME_RATE or input_frames == 0:
+            return input_frames
+        return (input_frames - 1) * self.output_rate // self.input_rate + 1
+
+    def convert(self, block: bytes) -> bytes:
+        """
+        Converts the next block of source PCM. Blocks must be whole frames and be passed in order.
+        """
+        samples = self.decode(block)
+        if self.resampler is not None:
+            return self.encode(self.resampler.resample(self.downmix(samples)))
+        if self.frame_rate != NATIVE_FRAME_RATE:
+            samples = self.resample(samples)
+        if self.channels == 2:
+            samples = (samples[:, 0] + samples[:, 1]) >> 1
+        elif self.channels > 2:
+            samples = (samples // self.channels).sum(axis=1)
+        else:
+            samples = samples[:, 0]
+        if self.width == 1:
+            samples = samples << 8
+        elif self.width == 4:
+            samples = samples >> 16
+        return samples.astype('<i2').tobytes()
+
+    def flush(self) -> bytes:
+        """
+        Returns the output still held back by the resampler once the last block has been converted.
+        """
+        if self.resampler is None:
+            return b''
+        return self.encode(self.resampler.flush())
+
+    def downmix(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Averages the channels into a float signal scaled to 16-bit sample values.
+        """
+        return samples.mean(axis=1) / 2 ** (8 * self.width - 16)
+
+    @staticmethod
+    def encode(samples: np.ndarray) -> bytes:
+        return np.clip(np.round(samples), -32768, 32767).astype('<i2').tobytes()
+
+    def decode(self, block: bytes) -> np.ndarray:
+        """
+        Decodes PCM into an int64 array of shape (frames, channels). Floating point samples are
+        scaled from the range -1.0 to 1.0 to 32-bit integers, clipping any beyond full scale.
+        """
+        if self.is_float:
+            samples = np.nan_to_num(
+                np.frombuffer(block, dtype=f'{self.byte_order}f{self.sample_width}').astype(np.float64)
+            )
+            samples = np.clip(np.round(samples * 2 ** 31), -2 ** 31, 2 ** 31 - 1).astype(np.int64)
+        elif self.sample_width == 1:
+            if self.signed_8bit:
+                samples = np.frombuffer(block, dtype=np.int8).astype(np.int64)
+            else:
+                samples = np.frombuffer(block, dtype=np.uint8).astype(np.int64) - 128
+        elif self.sample_width == 3:
+            raw = np.frombuffer(block, dtype=np.uint8).reshape(-1, 3).astype(np.int64)
+            if self.byte_order == '>':
+                raw = raw[:, ::-1]
+            samples = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+            samples = (samples ^ 0x800000) - 0x800000
+            samples = (samples << 8) | np.where(samples < 0, 0xFF, 0)
+        else:
+            samples = np.frombuffer(block, dtype=f'{self.byte_order}i{self.sample_width}').astype(np.int64)
+        return samples.reshape(-1, self.channels)
+
+    def resample(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Linear interpolation resampling, carrying the previous block's last frame and position.
+        Output frame j sits at input frame k = ceil(j * input_rate / output_rate) and is interpolated from frames
+        k - 1 and k, weighted by how far k lies past the output position.
+        """
+        if len(samples) == 0:
+            return samples
+        first_input = self.input_frames
+        self.input_frames += len(samples)
+        output_end = self.frame_count(self.input_frames)
+        outputs = np.arange(self.output_frames, output_end, dtype=np.int64)
+        self.output_frames = output_end
+        positions = -(-outputs * self.input_rate // self.output_rate)
+        weights = (positions * self.output_rate - outputs * self.input_rate)[:, np.newaxis]
+        scaled = np.concatenate([self.last_frame[np.newaxis, :], samples << self.shift])
+        self.last_frame = scaled[-1]
+        indexes = positions - first_input + 1
+        previous = scaled[indexes - 1]
+        current = scaled[indexes]
+        numerator = previous * weights + current * (self.output_rate - weights)
+        interpolated = np.sign(numerator) * (np.abs(numerator) // self.output_rate)
+        return interpolated >> self.shift
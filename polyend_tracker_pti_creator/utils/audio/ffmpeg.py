@@ -0,0 +1,130 @@
+import os
+import selectors
+import subprocess
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Union
+from polyend_tracker_pti_creator.utils.exceptions import (
+    CreatorDecodeException,
+    FfmpegNotInstalledException,
+)
+
+FFMPEG_EXECUTABLE = 'ffmpeg'
+# Files decoded by each ffmpeg process.
+BATCH_SIZE = 16
+READ_SIZE = 65536
+
+
+class FfmpegDecoder:
+    """
+    Decodes sources to 44.1 kHz, mono, 16-bit PCM with ffmpeg, amortizing its startup over batches of files.
+    Each ffmpeg process takes a batch of files as inputs and writes each one's PCM to a pipe of its own, which
+    are read at the same time so no pipe fills up and blocks ffmpeg. Up to processes batches are decoded at once.
+    Where pipes other than stdout cannot be passed to a child process, each file is decoded by a process of its
+    own.
+    """
+
+    def __init__(self, processes: int = 1, batch_size: int = BATCH_SIZE, executable: str = FFMPEG_EXECUTABLE) -> None:
+        self.processes = processes
+        self.batch_size = batch_size if os.name == 'posix' else 1
+        self.executable = executable
+
+    def decode(self, paths: Iterable[str]) -> Iterator[Union[bytes, Exception]]:
+        """
+        Yields the PCM of each path in order, or the exception raised decoding it. At most processes batches are
+        decoded ahead of the one being yielded.
+        """
+        in_flight: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=self.processes) as executor:
+            for batch in self.batches(paths):
+                if len(in_flight) >= self.processes:
+                    yield from in_flight.popleft().result()
+                in_flight.append(executor.submit(self.run, batch))
+            while in_flight:
+                yield from in_flight.popleft().result()
+
+    def batches(self, paths: Iterable[str]) -> Iterator[List[str]]:
+        batch = []
+        for path in paths:
+            batch.append(path)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def command(self, paths: List[str], outputs: List[str]) -> List[str]:
+        command = [self.executable, '-nostdin', '-hide_banner', '-loglevel', 'error']
+        for path in paths:
+            command += ['-i', path]
+        for index, output in enumerate(outputs):
+            command += ['-map', f'{index}:a:0', '-ac', '1', '-ar', '44100', '-c:a', 'pcm_s16le', '-f', 's16le', output]
+        return command
+
+    def run(self, paths: List[str]) -> List[Union[bytes, Exception]]:
+        """
+        Decodes a batch in one ffmpeg process. If it fails, each file is decoded again on its own, so the error is
+        reported only for the files ffmpeg could not decode.
+        """
+        if len(paths) == 1:
+            process = self.start(paths, ['pipe:1'], stdout=subprocess.PIPE)
+            output, error = process.communicate()
+            if process.returncode == 0:
+                return [output]
+            return [CreatorDecodeException(
+                f"Error! ffmpeg could not decode {paths[0]}: {error.decode(errors='replace').strip()}"
+            )]
+        pipes = [os.pipe() for _ in paths]
+        try:
+            process = self.start(paths, [f'pipe:{write_fd}' for _, write_fd in pipes], pass_fds=[
+                write_fd for _, write_fd in pipes
+            ])
+        except FfmpegNotInstalledException:
+            for read_fd, _ in pipes:
+                os.close(read_fd)
+            raise
+        finally:
+            for _, write_fd in pipes:
+                os.close(write_fd)
+        try:
+            buffers = self.drain([read_fd for read_fd, _ in pipes], process.stderr.fileno())
+        finally:
+            for read_fd, _ in pipes:
+                os.close(read_fd)
+            process.stderr.close()
+        if process.wait() == 0:
+            return [bytes(buffers[read_fd]) for read_fd, _ in pipes]
+        return [result for path in paths for result in self.run([path])]
+
+    def start(self, paths: List[str], outputs: List[str], **options) -> subprocess.Popen:
+        try:
+            return subprocess.Popen(  # pylint: disable=consider-using-with
+                self.command(paths, outputs), stdin=subprocess.DEVNULL, stderr=subprocess.PIPE, **options
+            )
+        except FileNotFoundError as exception:
+            raise FfmpegNotInstalledException(
+                "ffmpeg or libav is required to read audio from non-wave files. "
+                "Please download and install from ffmpeg.org or libav.org then try again."
+            ) from exception
+
+    @staticmethod
+    def drain(read_fds: List[int], stderr_fd: int) -> Dict[int, bytearray]:
+        """
+        Reads every output pipe and stderr until ffmpeg closes them. stderr is keyed by -1.
+        """
+        buffers = {read_fd: bytearray() for read_fd in read_fds}
+        buffers[-1] = bytearray()
+        with selectors.DefaultSelector() as selector:
+            for read_fd in read_fds:
+                selector.register(read_fd, selectors.EVENT_READ, read_fd)
+            selector.register(stderr_fd, selectors.EVENT_READ, -1)
+            open_fds = len(read_fds) + 1
+            while open_fds:
+                for key, _ in selector.select():
+                    data = os.read(key.fd, READ_SIZE)
+                    if data:
+                        buffers[key.data] += data
+                    else:
+                        selector.unregister(key.fd)
+                        open_fds -= 1
+        return buffers
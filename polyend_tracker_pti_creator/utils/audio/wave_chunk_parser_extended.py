@@ -141,6 +141,20 @@ class SampleChunk(Chunk):
             first_loop_play_count,
         )
 
+    @classmethod
+    def from_buffer(cls, buffer: bytes, offset: int) -> SampleChunk:
+        """
+        Reads the sample chunk from a wave file already held in memory.
+        Sample chunks without loops are shorter than the standard size, so missing loop fields read as 0.
+        """
+
+        if bytes(buffer[offset:offset + 4]) != cls.HEADER_SAMPLE:
+            raise InvalidHeaderException("Sample chunk must start with smpl")
+
+        content = bytes(buffer[offset + cls.OFFSET_CHUNK_CONTENT:offset + cls.LENGTH_CHUNK])
+        content = content.ljust(cls.LENGTH_CHUNK - cls.OFFSET_CHUNK_CONTENT, b"\x00")
+        return SampleChunk(*unpack("<IIIIIIIIIIIIIII", content))
+
     @property
     def manufacturer(self) -> int:
         """
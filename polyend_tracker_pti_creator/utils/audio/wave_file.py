@@ -0,0 +1,229 @@
+from __future__ import annotations
+import mmap
+import os
+from struct import unpack_from
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+from wave_chunk_parser.exceptions import (
+    InvalidHeaderException,
+)
+from polyend_tracker_pti_creator.utils.audio.wave_chunk_parser_extended import (
+    SampleChunk,
+)
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# The last 14 bytes of the KSDATAFORMAT_SUBTYPE GUIDs, whose first two bytes are the format code they stand for.
+SUBFORMAT_GUID_TAIL = b"\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71"
+
+
+class WaveFile:
+    """
+    A wave file parsed in a single pass over its chunk headers. Only the fmt, smpl, cue, acid and LIST chunk bodies
+    are read; the data chunk is located by its header and skipped, so parsing costs the same however long the audio.
+    """
+
+    HEADER_RIFF = b"RIFF"
+    HEADER_WAVE = b"WAVE"
+    CHUNK_FORMAT = b"fmt "
+    CHUNK_DATA = b"data"
+    CHUNK_SAMPLE = b"smpl"
+    CHUNK_CUE = b"cue "
+    CHUNK_ACID = b"acid"
+    CHUNK_LIST = b"LIST"
+    LIST_INFO = b"INFO"
+    OFFSET_CHUNKS = 12
+    LENGTH_CHUNK_HEADER = 8
+    LENGTH_FORMAT = 16
+    LENGTH_FORMAT_EXTENSIBLE = 40
+    LENGTH_CUE_POINT = 24
+    LENGTH_ACID = 24
+    # The format pydub is asked to decode files this reader cannot, such as compressed wave files.
+    FORMAT = "wav"
+    big_endian = False
+    signed_8bit = False
+
+    def __init__(self, buffer: Optional[bytes] = None) -> None:
+        """
+        Parses a wave file held in memory or memory-mapped.
+        Args:
+            buffer (bytes): The complete wave file.
+        """
+        self.path: Optional[str] = None
+        self._buffer = memoryview(buffer) if buffer is not None else None
+        self.audio_format = None
+        self.channels = None
+        self.frame_rate = None
+        self.block_align = None
+        self.bits_per_sample = None
+        self.valid_bits_per_sample = None
+        self.channel_mask = None
+        self.subformat = None
+        self.data_offset = None
+        self.data_length = 0
+        self.sample_chunk: Optional[SampleChunk] = None
+        self.cue_points: List[int] = []
+        self.tempo: Optional[float] = None
+        self.beats: Optional[int] = None
+        self.root_note: Optional[int] = None
+        self.info: Dict[str, str] = {}
+        if self._buffer is not None:
+            self.parse(lambda offset, length: self._buffer[offset:offset + length], len(self._buffer))
+
+    @classmethod
+    def from_file(cls, path: str, preload: bool = False) -> WaveFile:
+        """
+        Reads the chunk headers by seeking past each chunk, reading only the bodies of the chunks parsed. The data
+        chunk is memory-mapped when it is first used. With preload the whole file is read into memory instead.
+        """
+        with open(path, "rb") as file:
+            if preload:
+                return cls(file.read())
+            return cls.from_stream(file, path)
+
+    @classmethod
+    def from_stream(cls, stream: BinaryIO, path: Optional[str] = None) -> WaveFile:
+        """
+        Parses the chunk headers of a seekable stream. Without a path to map the data chunk from, data is not
+        available, but data_offset and data_length still locate it in the stream.
+        """
+        wave = cls()
+        wave.path = path
+        size = stream.seek(0, os.SEEK_END)
+
+        def read(offset: int, length: int) -> bytes:
+            stream.seek(offset)
+            return stream.read(length)
+
+        wave.parse(read, size)
+        return wave
+
+    def parse(self, read: Callable[[int, int], bytes], size: int) -> None:
+        header = read(0, self.OFFSET_CHUNKS)
+        if len(header) < self.OFFSET_CHUNKS or header[0:4] != self.HEADER_RIFF or header[8:12] != self.HEADER_WAVE:
+            raise InvalidHeaderException("Wave file must start with RIFF and be of type WAVE")
+        offset = self.OFFSET_CHUNKS
+        while offset + self.LENGTH_CHUNK_HEADER <= size:
+            chunk_header = read(offset, self.LENGTH_CHUNK_HEADER)
+            name = bytes(chunk_header[0:4])
+            (length,) = unpack_from("<I", chunk_header, 4)
+            content = offset + self.LENGTH_CHUNK_HEADER
+            if name == self.CHUNK_FORMAT:
+                self.parse_format(read(content, min(length, self.LENGTH_FORMAT_EXTENSIBLE)))
+            elif name == self.CHUNK_DATA:
+                self.data_offset = content
+                self.data_length = min(length, size - content)
+            elif name == self.CHUNK_SAMPLE:
+                self.sample_chunk = SampleChunk.from_buffer(read(offset, self.LENGTH_CHUNK_HEADER + length), 0)
+            elif name == self.CHUNK_CUE:
+                self.parse_cue(read(content, length))
+            elif name == self.CHUNK_ACID:
+                self.parse_acid(read(content, self.LENGTH_ACID))
+            elif name == self.CHUNK_LIST:
+                self.parse_list(read(content, length))
+            offset = content + length + (length % 2)
+        if self.audio_format is None:
+            raise InvalidHeaderException("Wave file is missing its fmt chunk")
+        if self.data_offset is None:
+            raise InvalidHeaderException("Wave file is missing its data chunk")
+
+    def parse_format(self, content: bytes) -> None:
+        (
+            self.audio_format,
+            self.channels,
+            self.frame_rate,
+            _,
+            self.block_align,
+            self.bits_per_sample,
+        ) = unpack_from("<HHIIHH", content)
+        if self.audio_format == WAVE_FORMAT_EXTENSIBLE and len(content) >= self.LENGTH_FORMAT_EXTENSIBLE:
+            # The extension gives the sample format as a GUID, and the valid bits of samples in wider containers.
+            _, self.valid_bits_per_sample, self.channel_mask, self.subformat = unpack_from("<HHIH", content, 16)
+            if bytes(content[26:40]) != SUBFORMAT_GUID_TAIL:
+                self.subformat = None
+
+    def parse_cue(self, content: bytes) -> None:
+        (number_of_cue_points,) = unpack_from("<I", content)
+        self.cue_points = [
+            unpack_from("<I", content, 4 + i * self.LENGTH_CUE_POINT + 20)[0]
+            for i in range(number_of_cue_points)
+        ]
+
+    def parse_acid(self, content: bytes) -> None:
+        """
+        ACID loop information: root note, length in beats and tempo in beats per minute.
+        """
+        if len(content) < self.LENGTH_ACID:
+            return
+        _, self.root_note, _, _, self.beats, _, _, self.tempo = unpack_from("<IHHfIHHf", content)
+
+    def parse_list(self, content: bytes) -> None:
+        """
+        INFO list text fields, such as INAM (title), keyed by their four character id.
+        """
+        if bytes(content[0:4]) != self.LIST_INFO:
+            return
+        offset = 4
+        while offset + self.LENGTH_CHUNK_HEADER <= len(content):
+            name = bytes(content[offset:offset + 4]).decode("ASCII", errors="replace")
+            (length,) = unpack_from("<I", content, offset + 4)
+            value = bytes(content[offset + self.LENGTH_CHUNK_HEADER:offset + self.LENGTH_CHUNK_HEADER + length])
+            self.info[name] = value.split(b"\x00", 1)[0].decode("latin-1")
+            offset += self.LENGTH_CHUNK_HEADER + length + (length % 2)
+
+    @property
+    def loop(self) -> Optional[Tuple[int, int]]:
+        """
+        The first loop start and end frames of the smpl chunk, if it has a loop.
+        """
+        if self.sample_chunk is None or self.sample_chunk.number_of_sample_loops == 0:
+            return None
+        return self.sample_chunk.first_loop_start, self.sample_chunk.first_loop_end
+
+    @property
+    def buffer(self) -> memoryview:
+        """
+        The whole file, memory-mapped on first use when only the chunk headers were read.
+        """
+        if self._buffer is None:
+            if self.path is None:
+                raise ValueError("Wave file was parsed from a stream; read its data from data_offset instead")
+            with open(self.path, "rb") as file:
+                self._buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        return self._buffer
+
+    @property
+    def format_code(self) -> int:
+        """
+        The sample format, read from the subformat of extensible wave files.
+        """
+        return self.subformat if self.audio_format == WAVE_FORMAT_EXTENSIBLE else self.audio_format
+
+    @property
+    def is_pcm(self) -> bool:
+        """
+        Whether the samples are 8, 16, 24 or 32-bit integers.
+        """
+        return self.format_code == WAVE_FORMAT_PCM and self.sample_width in (1, 2, 3, 4)
+
+    @property
+    def is_float(self) -> bool:
+        """
+        Whether the samples are 32 or 64-bit floating point.
+        """
+        return self.format_code == WAVE_FORMAT_IEEE_FLOAT and self.sample_width in (4, 8)
+
+    @property
+    def sample_width(self) -> int:
+        """
+        Bytes per sample as stored. Samples with fewer valid bits, such as 20-bit, are left-justified in them.
+        """
+        return self.block_align // self.channels if self.channels else 0
+
+    @property
+    def frame_count(self) -> int:
+        return self.data_length // self.block_align
+
+    @property
+    def data(self) -> memoryview:
+        return self.buffer[self.data_offset:self.data_offset + self.frame_count * self.block_align]
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Set, Tuple
+
+MANIFEST_FILE_NAME = '.pti-manifest.json'
+# Bump when a change to conversion alters the bytes written for the same source and settings.
+CACHE_VERSION = 1
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Cache:
+    """
+    Content-addressed record of converted .pti files, kept as a manifest in each destination directory.
+    An output is up to date when it still exists as written and the hash of its sources and effective settings
+    matches the one it was written from. Source hashes are reused while a source's size and mtime are unchanged,
+    so unchanged sources are not read again.
+    """
+
+    def __init__(self) -> None:
+        self.manifests: Dict[str, Dict] = {}
+        self.pending: Dict[str, Tuple[str, List[Dict]]] = {}
+        # Directories with outputs recorded since their manifest was read.
+        self.changed: Set[str] = set()
+
+    def manifest(self, directory: str) -> Dict:
+        if directory not in self.manifests:
+            try:
+                with open(os.path.join(directory, MANIFEST_FILE_NAME), encoding='utf-8') as manifest_file:
+                    manifest = json.load(manifest_file)
+            except (OSError, ValueError):
+                manifest = {}
+            self.manifests[directory] = manifest if manifest.get('version') == CACHE_VERSION \
+                else {'version': CACHE_VERSION, 'outputs': {}}
+        return self.manifests[directory]
+
+    @staticmethod
+    def output_path(file: Dict) -> str:
+        return os.path.join(file['destination_path'], file['destination_file_name'] + file['destination_extension'])
+
+    @staticmethod
+    def source_path(file: Dict) -> str:
+        return os.path.join(file['source_path'], file['source_file_name'] + file['source_extension'])
+
+    def entry(self, output_path: str) -> Dict:
+        return self.manifest(os.path.dirname(output_path))['outputs'].get(os.path.basename(output_path), {})
+
+    def source(self, path: str, recorded: Dict) -> Dict:
+        stat = os.stat(path)
+        if recorded.get('size') == stat.st_size and recorded.get('mtime_ns') == stat.st_mtime_ns:
+            return recorded
+        return {'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': hash_file(path)}
+
+    def sources(self, files: List[Dict], entry: Dict) -> List[Dict]:
+        recorded = {source['path']: source for source in entry.get('sources', [])}
+        paths = [os.path.abspath(self.source_path(file)) for file in files]
+        return [self.source(path, recorded.get(path, {})) for path in paths]
+
+    @staticmethod
+    def key(sources: List[Dict], options: Dict) -> str:
+        return hashlib.sha256(json.dumps(
+            {'sources': [source['sha256'] for source in sources], 'options': options},
+            sort_keys=True,
+        ).encode('utf-8')).hexdigest()
+
+    def is_current(self, files: List[Dict], options: Dict) -> bool:
+        """
+        Whether the .pti built from files (the first file naming the output) is up to date.
+        Args:
+            files (List[Dict]): Source file dicts; one for normal mode, every slice in order for merge mode.
+            options (Dict): Effective settings that change the written bytes.
+        """
+        output_path = self.output_path(files[0])
+        entry = self.entry(output_path)
+        try:
+            sources = self.sources(files, entry)
+        except OSError:
+            # A missing or unreadable source is left for the conversion to report.
+            return False
+        key = self.key(sources, options)
+        self.pending[output_path] = (key, sources)
+        if entry.get('key') != key:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return False
+        return entry.get('output') == {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def record(self, files: List[Dict], options: Dict) -> None:
+        """
+        Records that the .pti built from files has just been written.
+        """
+        output_path = self.output_path(files[0])
+        if output_path in self.pending:
+            key, sources = self.pending.pop(output_path)
+        else:
+            sources = self.sources(files, self.entry(output_path))
+            key = self.key(sources, options)
+        stat = os.stat(output_path)
+        self.changed.add(os.path.dirname(output_path))
+        self.manifest(os.path.dirname(output_path))['outputs'][os.path.basename(output_path)] = {
+            'key': key,
+            'sources': sources,
+            'output': {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns},
+        }
+
+    def save(self) -> None:
+        """
+        Writes the manifests of the directories outputs were recorded in. It runs after failed conversions too, so
+        a manifest that cannot be written is skipped rather than raised in place of the conversion error; its outputs
+        are only converted again on the next run.
+        """
+        for directory in sorted(self.changed):
+            path = os.path.join(directory, MANIFEST_FILE_NAME)
+            try:
+                with open(path + '.tmp', 'w', encoding='utf-8') as manifest_file:
+                    json.dump(self.manifests[directory], manifest_file, indent=2, sort_keys=True)
+                os.replace(path + '.tmp', path)
+            except OSError:
+                pass
+        self.changed.clear()
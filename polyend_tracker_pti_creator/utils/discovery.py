@@ -0,0 +1,127 @@
+import os
+import re
+from collections.abc import Sequence
+from fnmatch import fnmatch
+from typing import Iterable, Iterator, List, Optional
+
+SOURCE_EXTENSIONS = ['.wav', '.aif', '.aiff', '.aifc']
+# Source formats only ffmpeg can decode.
+FFMPEG_EXTENSIONS = ['.flac', '.mp3', '.ogg']
+
+
+def natural_key(name: str) -> tuple:
+    """
+    Sort key that orders runs of digits by value, so 'kick 2' comes before 'kick 10'.
+    Names are compared by stem before extension, so 'tone.wav' comes before 'tone2.wav'.
+    """
+    stem, extension = os.path.splitext(name)
+    return natural_parts(stem), natural_parts(extension), name
+
+
+def natural_parts(text: str) -> list:
+    parts = re.split(r'(\d+)', text)
+    return [int(part) if index % 2 else part.lower() for index, part in enumerate(parts)]
+
+
+def matches(relative_path: str, patterns: List[str]) -> bool:
+    """
+    Whether a path relative to the source matches any glob. Patterns containing '/' match the whole relative path,
+    others match the file or directory name alone.
+    """
+    name = relative_path.rsplit('/', 1)[-1]
+    return any(fnmatch(relative_path if '/' in pattern else name, pattern) for pattern in patterns)
+
+
+def discover(
+        source: str,
+        recursive: bool = False,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        extensions: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """
+    Yields the source files under source in natural order, one directory at a time, so the first file is yielded
+    as soon as its directory has been listed rather than after the whole tree has been walked.
+    Args:
+        source (str): A source file or directory.
+        recursive (bool): Whether to descend into subdirectories.
+        include (List[str]): Globs a file must match, if given.
+        exclude (List[str]): Globs of files and directories to skip. Excluded directories are not descended into.
+        extensions (List[str]): Lower case file extensions to yield. Defaults to SOURCE_EXTENSIONS.
+    """
+    extensions = extensions or SOURCE_EXTENSIONS
+    if os.path.isfile(source):
+        if os.path.splitext(source)[1].lower() in extensions:
+            yield source
+        return
+    yield from scan(source, '', recursive, include or [], exclude or [], extensions)
+
+
+def scan(directory: str, relative_directory: str, recursive: bool, include: List[str],
+         exclude: List[str], extensions: List[str]) -> Iterator[str]:
+    with os.scandir(directory) as iterator:
+        entries = sorted(iterator, key=lambda entry: natural_key(entry.name))
+    for entry in entries:
+        relative_path = relative_directory + entry.name
+        if exclude and matches(relative_path, exclude):
+            continue
+        if entry.is_dir():
+            if recursive:
+                yield from scan(entry.path, relative_path + '/', recursive, include, exclude, extensions)
+        elif os.path.splitext(entry.name)[1].lower() in extensions \
+                and (not include or matches(relative_path, include)):
+            yield os.path.join(directory, entry.name)
+
+
+class LazySequence(Sequence):
+    """
+    A sequence filled from an iterator as it is read. Iterating, indexing and slicing only pull as many items as
+    needed, while len() and negative indexes read the iterator to the end. Items already read are kept, so it can be
+    iterated again.
+    """
+
+    def __init__(self, iterable: Iterable) -> None:
+        self.iterator = iter(iterable)
+        self.items = []
+
+    def fill(self, count: Optional[int] = None) -> None:
+        while self.iterator is not None and (count is None or len(self.items) < count):
+            try:
+                self.items.append(next(self.iterator))
+            except StopIteration:
+                self.iterator = None
+
+    def __iter__(self) -> Iterator:
+        index = 0
+        while True:
+            self.fill(index + 1)
+            if index >= len(self.items):
+                return
+            yield self.items[index]
+            index += 1
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and index >= 0:
+            self.fill(index + 1)
+        elif isinstance(index, slice) and index.stop is not None and index.stop >= 0 \
+                and (index.start is None or index.start >= 0):
+            self.fill(index.stop)
+        else:
+            self.fill()
+        return self.items[index]
+
+    def __len__(self) -> int:
+        self.fill()
+        return len(self.items)
+
+    def __bool__(self) -> bool:
+        self.fill(1)
+        return len(self.items) > 0
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
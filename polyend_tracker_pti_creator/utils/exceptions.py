@@ -68,6 +68,58 @@ class CreatorSampleTooLongException(Exception):
     pass
 
 
+class CreatorResampleQualityInvalidException(Exception):
+    """
+    Indicates the resample quality argument is invalid value.
+    Valid Values:
+        fast
+        balanced
+        best
+    """
+
+    pass
+
+
+class CreatorJobsInvalidException(Exception):
+    """
+    Indicates the jobs argument is not a positive whole number.
+    """
+
+    pass
+
+
+class CreatorBatchException(Exception):
+    """
+    Indicates one or more files of a parallel batch failed to convert.
+    """
+
+    pass
+
+
+class CreatorInvalidPtiException(Exception):
+    """
+    Indicates a file read as a .pti does not start with a .pti header.
+    """
+
+    pass
+
+
+class CreatorRequestInvalidException(Exception):
+    """
+    Indicates a conversion request sent to the service has no wave files or cannot be read.
+    """
+
+    pass
+
+
+class CreatorDecodeException(Exception):
+    """
+    Indicates ffmpeg could not decode a source file.
+    """
+
+    pass
+
+
 class FfmpegNotInstalledException(Exception):
     """
     Indicates that ffmpeg is not installed.
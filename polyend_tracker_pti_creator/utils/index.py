@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+from typing import Dict, Iterator, List, NamedTuple, Optional
+from polyend_tracker_pti_creator.utils.cache import hash_file
+from polyend_tracker_pti_creator.utils.discovery import discover
+from polyend_tracker_pti_creator.utils.exceptions import CreatorInvalidPtiException
+from polyend_tracker_pti_creator.utils.pti.instrument import Instrument
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS instruments (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    instrument_name TEXT NOT NULL,
+    playback TEXT,
+    sample_length INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    loop_start INTEGER NOT NULL,
+    loop_end INTEGER NOT NULL,
+    number_of_slices INTEGER NOT NULL,
+    slice_points TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS instruments_playback ON instruments (playback, seconds);
+CREATE INDEX IF NOT EXISTS instruments_seconds ON instruments (seconds);
+CREATE INDEX IF NOT EXISTS instruments_name ON instruments (instrument_name);
+CREATE INDEX IF NOT EXISTS instruments_sha256 ON instruments (sha256);
+"""
+COLUMNS = [
+    'path', 'size', 'mtime_ns', 'sha256', 'instrument_name', 'playback', 'sample_length', 'seconds',
+    'loop_start', 'loop_end', 'number_of_slices', 'slice_points',
+]
+# Rows written per transaction while updating.
+BATCH_SIZE = 1000
+
+
+class UpdateResult(NamedTuple):
+    added: int
+    updated: int
+    unchanged: int
+    removed: int
+    invalid: List[str]
+
+
+class Index:
+    """
+    SQLite index of a .pti library. Updating parses only the 392 byte header of each new or changed file, and
+    hashes its content. Files whose size and mtime are unchanged since the last update are not opened at all.
+    """
+
+    def __init__(self, database: str) -> None:
+        self.connection = sqlite3.connect(database)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'Index':
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    @staticmethod
+    def row(path: str, stat: os.stat_result) -> Dict:
+        instrument = Instrument(path)
+        return {
+            'path': path,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': hash_file(path),
+            'instrument_name': instrument.instrument_name,
+            'playback': instrument.playback,
+            'sample_length': instrument.sample_length,
+            'seconds': instrument.sample_length / 44100,
+            'loop_start': instrument.loop_points[0],
+            'loop_end': instrument.loop_points[1],
+            'number_of_slices': instrument.header.fields['number_of_slices'],
+            'slice_points': json.dumps(instrument.slice_points),
+        }
+
+    def update(self, root: str) -> UpdateResult:
+        """
+        Brings the index up to date with the .pti files under root: new and changed files are read, and files
+        no longer there are removed.
+        """
+        root = os.path.abspath(root)
+        prefix = root if os.path.isfile(root) else os.path.join(root, '')
+        known = {
+            row['path']: (row['size'], row['mtime_ns'])
+            for row in self.connection.execute(
+                "SELECT path, size, mtime_ns FROM instruments WHERE path = ? OR substr(path, 1, ?) = ?",
+                (root, len(prefix), prefix),
+            )
+        }
+        added = updated = unchanged = 0
+        invalid = []
+        rows = []
+        for path in discover(root, recursive=True, extensions=['.pti']):
+            stat = os.stat(path)
+            recorded = known.pop(path, None)
+            if recorded == (stat.st_size, stat.st_mtime_ns):
+                unchanged += 1
+                continue
+            try:
+                rows.append(self.row(path, stat))
+            except (CreatorInvalidPtiException, OSError):
+                invalid.append(path)
+                # A file that is no longer a valid .pti is dropped from the index with the removed files.
+                if recorded is not None:
+                    known[path] = recorded
+                continue
+            if recorded is None:
+                added += 1
+            else:
+                updated += 1
+            if len(rows) >= BATCH_SIZE:
+                self.write(rows)
+                rows = []
+        self.write(rows)
+        with self.connection:
+            self.connection.executemany("DELETE FROM instruments WHERE path = ?", [(path,) for path in known])
+        return UpdateResult(added, updated, unchanged, len(known), invalid)
+
+    def write(self, rows: List[Dict]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO instruments ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join(':' + column for column in COLUMNS)})",
+                rows,
+            )
+
+    def query(
+            self,
+            playback: Optional[str] = None,
+            min_seconds: Optional[float] = None,
+            max_seconds: Optional[float] = None,
+            name: Optional[str] = None,
+            sha256: Optional[str] = None,
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Yields the indexed instruments matching every filter given, in path order.
+        Args:
+            playback (str): Playback mode, such as beat-slice.
+            min_seconds (float): Shortest sample length in seconds.
+            max_seconds (float): Longest sample length in seconds.
+            name (str): Glob the instrument name must match, such as 'kick*'.
+            sha256 (str): Content hash, to find copies of the same instrument.
+        """
+        conditions = []
+        parameters = []
+        for condition, value in [
+            ('playback = ?', playback),
+            ('seconds >= ?', min_seconds),
+            ('seconds <= ?', max_seconds),
+            ('instrument_name GLOB ?', name),
+            ('sha256 = ?', sha256),
+        ]:
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        yield from self.connection.execute(f"SELECT * FROM instruments{where} ORDER BY path", parameters)
@@ -0,0 +1,137 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+STAGES = ['discovery', 'parse', 'convert', 'header', 'write']
+
+
+class Profiler:
+    """
+    Wall and CPU time spent in each stage of each file, keyed by source path. CPU time is that of the thread
+    running the stage, so stages running at the same time in other threads or processes are not counted twice.
+    Stages are exclusive: time spent in a stage nested inside another is only counted for the inner stage.
+    """
+
+    def __init__(self) -> None:
+        self.files: Dict[str, Dict[str, List[float]]] = {}
+        self.started = time.perf_counter()
+
+    def add(self, key: str, stage_name: str, wall: float, cpu: float) -> None:
+        timing = self.files.setdefault(key, {}).setdefault(stage_name, [0.0, 0.0])
+        timing[0] += wall
+        timing[1] += cpu
+
+    def merge(self, files: Dict[str, Dict[str, List[float]]]) -> None:
+        """
+        Adds the timings recorded by another profiler, such as one in a worker process.
+        """
+        for key, stages in files.items():
+            for stage_name, (wall, cpu) in stages.items():
+                self.add(key, stage_name, wall, cpu)
+
+    def stages(self) -> Dict[str, Dict[str, float]]:
+        totals = {}
+        for stage_name in STAGES:
+            timings = [stages[stage_name] for stages in self.files.values() if stage_name in stages]
+            totals[stage_name] = {
+                'wall': sum(timing[0] for timing in timings),
+                'cpu': sum(timing[1] for timing in timings),
+                'files': len(timings),
+            }
+        return totals
+
+    def report(self) -> Dict:
+        return {
+            'wall': time.perf_counter() - self.started,
+            'stages': self.stages(),
+            'files': {
+                key: {stage_name: {'wall': wall, 'cpu': cpu} for stage_name, (wall, cpu) in stages.items()}
+                for key, stages in self.files.items()
+            },
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(self.report(), report_file, indent=2)
+
+    def summary(self) -> str:
+        stages = self.stages()
+        stage_wall = sum(totals['wall'] for totals in stages.values()) or 1
+        lines = [f"{'stage':<12}{'files':>8}{'wall s':>12}{'cpu s':>12}{'share':>9}{'ms / file':>12}"]
+        for stage_name, totals in stages.items():
+            lines.append(
+                f"{stage_name:<12}{totals['files']:>8}{totals['wall']:>12.4f}{totals['cpu']:>12.4f}"
+                f"{totals['wall'] / stage_wall:>9.1%}"
+                f"{1000 * totals['wall'] / totals['files'] if totals['files'] else 0:>12.3f}"
+            )
+        lines.append(f"{len(self.files)} file(s) in {time.perf_counter() - self.started:.4f} s")
+        return '\n'.join(lines)
+
+
+profiler: Optional[Profiler] = None
+# Time spent in nested stages, per enclosing stage of the current thread.
+nested = threading.local()
+
+
+def enable() -> Profiler:
+    """
+    Starts recording stage timings, discarding any recorded before.
+    """
+    global profiler  # pylint: disable=global-statement
+    profiler = Profiler()
+    return profiler
+
+
+def disable() -> Optional[Profiler]:
+    """
+    Stops recording and returns the profiler that was recording, if any.
+    """
+    global profiler  # pylint: disable=global-statement
+    disabled, profiler = profiler, None
+    return disabled
+
+
+@contextmanager
+def stage(stage_name: str, key: str) -> Iterator[None]:
+    """
+    Times the enclosed block as a stage of the file key. Does nothing unless profiling is enabled.
+    """
+    if profiler is None:
+        yield
+        return
+    if not hasattr(nested, 'stack'):
+        nested.stack = []
+    excluded = [0.0, 0.0]
+    nested.stack.append(excluded)
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall
+        cpu = time.thread_time() - cpu
+        nested.stack.pop()
+        if nested.stack:
+            nested.stack[-1][0] += wall
+            nested.stack[-1][1] += cpu
+        if profiler is not None:
+            profiler.add(key, stage_name, wall - excluded[0], cpu - excluded[1])
+
+
+def timed(iterable: Iterable[str], stage_name: str) -> Iterator[str]:
+    """
+    Yields from iterable, timing the wait for each item as a stage of the file the item names.
+    """
+    iterator = iter(iterable)
+    while True:
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        if profiler is not None:
+            profiler.add(item, stage_name, time.perf_counter() - wall, time.thread_time() - cpu)
+        yield item
@@ -1,33 +1,90 @@
-# pylint: disable=consider-using-generator
+from __future__ import annotations
 import struct
-from copy import deepcopy
+from typing import Any, Dict, Tuple
 from lazy_property import LazyProperty
+from polyend_tracker_pti_creator.utils.exceptions import CreatorInvalidPtiException
 from polyend_tracker_pti_creator.utils.pti.constants import PTI_HEADER_DEFINITION
 
 
+def compile_header(definition: Dict) -> Tuple[struct.Struct, Dict[str, Tuple[int, struct.Struct]], bytes]:
+    """
+    Compiles a header definition once into the whole-header struct, a field name to (offset, field struct) index
+    and the default header packed into bytes.
+    """
+    header_struct = struct.Struct('<' + ''.join([field['type'] for field in definition.values()]))
+    fields = {}
+    offset = 0
+    for name, field in definition.items():
+        field_struct = struct.Struct('<' + field['type'])
+        fields[name] = (offset, field_struct)
+        offset += field_struct.size
+    template = header_struct.pack(*[field['value'] for field in definition.values()])
+    return header_struct, fields, template
+
+
+HEADER_STRUCT, HEADER_FIELDS, HEADER_TEMPLATE = compile_header(PTI_HEADER_DEFINITION)
+HEADER_LENGTH = HEADER_STRUCT.size
+FILE_TYPE_INDICATOR = PTI_HEADER_DEFINITION['file_type_indicator']['value']
+
+
 class Header:
     def __init__(self, settings):
-        self.definition = deepcopy(PTI_HEADER_DEFINITION)
+        self.settings = {}
         for key, value in settings.items():
+            if key not in HEADER_FIELDS:
+                raise KeyError(key)
             if isinstance(value, str):
                 value = self.encode_string(value)
-            self.definition[key]['value'] = value
+            self.settings[key] = value
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Header:
+        """
+        Parses the header at the start of a .pti file. Every field is unpacked in one call, string fields kept as the
+        raw bytes stored so that data_bytes gives back the header exactly.
+        Args:
+            data (bytes): At least the first HEADER_LENGTH bytes of a .pti file.
+        """
+        if len(data) < HEADER_LENGTH or bytes(data[0:len(FILE_TYPE_INDICATOR)]) != FILE_TYPE_INDICATOR:
+            raise CreatorInvalidPtiException(
+                f"Error! Not a .pti file. Expected a {HEADER_LENGTH} byte header starting with "
+                f"{FILE_TYPE_INDICATOR.decode('ASCII')}."
+            )
+        header = cls(dict(zip(HEADER_FIELDS, HEADER_STRUCT.unpack_from(data))))
+        header._data_bytes = bytearray(data[0:HEADER_LENGTH])  # pylint: disable=protected-access
+        return header
+
+    @LazyProperty
+    def fields(self) -> Dict[str, Any]:
+        """
+        Every field by name, string fields decoded up to their first NUL byte.
+        """
+        return {
+            name: self.decode_string(value) if isinstance(value, bytes) else value
+            for name, value in zip(HEADER_FIELDS, self.data)
+        }
 
     @LazyProperty
     def format(self) -> str:
-        return '<' + ''.join([value['type'] for value in self.definition.values()])
+        return HEADER_STRUCT.format
 
     @LazyProperty
     def data(self) -> tuple:
-        return tuple([value['value'] for value in self.definition.values()])
+        return HEADER_STRUCT.unpack(self.data_bytes)
 
     @LazyProperty
     def data_bytes(self) -> bytearray:
-        return bytearray(struct.pack(self.format, * self.data))
+        data_bytes = bytearray(HEADER_TEMPLATE)
+        for key, value in self.settings.items():
+            offset, field_struct = HEADER_FIELDS[key]
+            field_struct.pack_into(data_bytes, offset, value)
+        return data_bytes
+
+    @staticmethod
+    def decode_string(value: bytes) -> str:
+        return value.split(b'\x00', 1)[0].decode('ASCII', errors='replace')
 
     @staticmethod
     def encode_string(string):
         ascii_string = string.encode('ASCII')
-        pad_length = 32 - len(ascii_string)
-        pad = b''.join([b'\x00' for x in range(pad_length)])
-        return ascii_string + pad
+        return ascii_string.ljust(32, b'\x00')
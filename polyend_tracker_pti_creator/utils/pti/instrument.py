@@ -0,0 +1,62 @@
+import mmap
+from typing import List, Optional
+from lazy_property import LazyProperty
+from polyend_tracker_pti_creator.utils.exceptions import CreatorInvalidPtiException
+from polyend_tracker_pti_creator.utils.pti.constants import PLAYBACK_VALUES
+from polyend_tracker_pti_creator.utils.pti.header import Header, HEADER_LENGTH
+
+MAX_SLICES = 48
+
+
+class Instrument:
+    """
+    An existing .pti file read back. Only the header is read until the PCM is asked for, which is then
+    memory-mapped rather than copied.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @LazyProperty
+    def header(self) -> Header:
+        with open(self.path, 'rb') as file:
+            return Header.from_bytes(file.read(HEADER_LENGTH))
+
+    @LazyProperty
+    def pcm(self) -> memoryview:
+        """
+        The 44.1 kHz, mono, 16-bit PCM as a memoryview of signed samples over the memory-mapped file.
+        """
+        with open(self.path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        length = min(self.sample_length * 2, len(mapped) - HEADER_LENGTH) // 2 * 2
+        return memoryview(mapped)[HEADER_LENGTH:HEADER_LENGTH + length].cast('h')
+
+    @property
+    def instrument_name(self) -> str:
+        return self.header.fields['instrument_name']
+
+    @property
+    def sample_length(self) -> int:
+        return self.header.fields['sample_length']
+
+    @property
+    def playback(self) -> Optional[str]:
+        sample_playback = self.header.fields['sample_playback']
+        return next((name for name, value in PLAYBACK_VALUES.items() if value == sample_playback), None)
+
+    @property
+    def loop_points(self) -> List[int]:
+        return [self.header.fields['loop_start'], self.header.fields['loop_end']]
+
+    @property
+    def slice_points(self) -> List[int]:
+        number_of_slices = self.header.fields['number_of_slices']
+        if number_of_slices > MAX_SLICES:
+            raise CreatorInvalidPtiException(
+                f"Error! {self.path} has {number_of_slices} slices. A .pti holds at most {MAX_SLICES}."
+            )
+        return [
+            self.header.fields[f'slice_{str(i + 1).zfill(2)}_adjust']
+            for i in range(number_of_slices)
+        ]
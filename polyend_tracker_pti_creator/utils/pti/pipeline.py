@@ -0,0 +1,103 @@
+import asyncio
+import os
+from typing import Dict, Iterator, Optional
+from polyend_tracker_pti_creator.utils import profiling
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+
+# Files held between stages. Each stage can run this far ahead of the next before it waits.
+QUEUE_SIZE = 2
+
+
+def read_file(file: Dict, playback: str, resample_quality: str) -> Dict:
+    if 'audio' in file or 'error' in file:
+        return PTI.raise_error(file)
+    return PTI.load_file(file, playback, resample_quality, preload=True)
+
+
+def convert_file(file: Dict) -> bytes:
+    return bytes(PTI.header(file).data_bytes) + file['audio'].pcm
+
+
+def write_file(file: Dict, data: bytes) -> None:
+    with profiling.stage('write', PTI.source_path(file)):
+        os.makedirs(file['destination_path'], exist_ok=True)
+        with open(PTI.destination(file), mode='wb') as pti_file:
+            pti_file.write(data)
+
+
+class Pipeline:
+    """
+    Overlapped batch conversion for a single core or slow storage. Reading the next source, converting the current
+    one and writing the previous .pti run at the same time in executor threads, connected by bounded queues so at
+    most QUEUE_SIZE files wait between stages. Failures are collected and reported together once every file has
+    been attempted, as in a parallel batch.
+    """
+
+    def __init__(self, pti: PTI, queue_size: int = QUEUE_SIZE) -> None:
+        self.pti = pti
+        self.queue_size = queue_size
+        self.errors = []
+        self.attempted = 0
+
+    def create(self) -> None:
+        asyncio.run(self.run())
+        if self.errors:
+            raise PTI.batch_error(self.errors, self.attempted)
+
+    async def run(self) -> None:
+        converting = asyncio.Queue(self.queue_size)
+        writing = asyncio.Queue(self.queue_size)
+        try:
+            await asyncio.gather(self.read(converting), self.convert(converting, writing), self.write(writing))
+        finally:
+            if self.pti.cache is not None:
+                self.pti.cache.save()
+
+    async def read(self, converting: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        # Listing the source directory is file I/O too, so files are pulled from the settings off the event loop.
+        pending: Iterator[Dict] = self.pti.decoded(self.pti.pending())
+        while True:
+            file: Optional[Dict] = await loop.run_in_executor(None, next, pending, None)
+            if file is None:
+                break
+            self.attempted += 1
+            try:
+                loaded = await loop.run_in_executor(
+                    None, read_file, file, self.pti.playback, self.pti.resample_quality
+                )
+            except Exception as exception:  # pylint: disable=broad-except
+                self.errors.append(PTI.failure(file, exception))
+                continue
+            await converting.put((file, loaded))
+        await converting.put(None)
+
+    async def convert(self, converting: asyncio.Queue, writing: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await converting.get()
+            if item is None:
+                break
+            file, loaded = item
+            try:
+                data = await loop.run_in_executor(None, convert_file, loaded)
+            except Exception as exception:  # pylint: disable=broad-except
+                self.errors.append(PTI.failure(file, exception))
+                continue
+            finally:
+                del item, loaded
+            await writing.put((file, data))
+        await writing.put(None)
+
+    async def write(self, writing: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await writing.get()
+            if item is None:
+                break
+            file, data = item
+            try:
+                await loop.run_in_executor(None, write_file, file, data)
+                self.pti.record(file)
+            except Exception as exception:  # pylint: disable=broad-except
+                self.errors.append(PTI.failure(file, exception))
@@ -1,66 +1,319 @@
 import os
-from typing import List, Dict
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 from pydub.audio_segment import AudioSegment
+from polyend_tracker_pti_creator.utils import profiling
 from polyend_tracker_pti_creator.utils.audio.audio import Audio
+from polyend_tracker_pti_creator.utils.audio.ffmpeg import FfmpegDecoder
+from polyend_tracker_pti_creator.utils.cache import Cache
+from polyend_tracker_pti_creator.utils.discovery import FFMPEG_EXTENSIONS
 from polyend_tracker_pti_creator.utils.exceptions import (
     CreatorTooManyMergeFilesException,
     CreatorSampleTooLongException,
+    CreatorBatchException,
 )
 from polyend_tracker_pti_creator.utils.pti.header import Header
+from polyend_tracker_pti_creator.utils.pti.instrument import Instrument
 from polyend_tracker_pti_creator.utils.pti.constants import PLAYBACK_VALUES
 
+MAX_DURATION = 30000
+# Files submitted to the pool ahead of the one being collected, per worker. Keeps workers busy without holding the
+# whole batch in flight.
+IN_FLIGHT_PER_JOB = 2
+
+
+def convert_file(file: Dict, playback: str, resample_quality: str, profile: bool = False) -> Optional[Dict]:
+    """
+    Loads and writes a single file of a batch. Runs in a worker process of a parallel batch.
+    With profile, returns the stage timings recorded in the worker.
+    """
+    if profile:
+        profiling.enable()
+    try:
+        PTI.write_file(PTI.load_file(file, playback, resample_quality))
+    finally:
+        profiler = profiling.disable()
+    return profiler.files if profiler is not None else None
+
 
 class PTI:
     def __init__(self, settings: dict) -> None:
         self.files = settings['files']
         self.mode = settings['mode']
         self.playback = settings['playback']
+        self.jobs = settings.get('jobs', 1)
+        self.resample_quality = settings.get('resample_quality', 'fast')
+        self.cache = Cache() if settings.get('incremental') else None
+        self.decoder = FfmpegDecoder(self.jobs) if settings.get('ffmpeg') else None
+        self.merged_files = self.files
+        self.skipped = 0
         if self.mode == 'merge':
+            if self.cache is not None and self.cache.is_current(self.merged_files, self.options(self.files[0])):
+                self.skipped = 1
+                self.files = []
+                return
             self.merge_audio()
-        else:
-            self.get_audio()
+
+    @property
+    def parallel(self) -> bool:
+        return self.mode != 'merge' and self.jobs > 1 and len(self.files[:2]) > 1
+
+    def options(self, file: Dict) -> Dict:
+        """
+        The settings that, together with the source content, determine the bytes written for a file.
+        """
+        return {
+            'mode': self.mode,
+            'playback': self.playback,
+            'instrument_name': file['instrument_name'],
+            'resample_quality': self.resample_quality,
+        }
+
+    def sources(self, file: Dict) -> List[Dict]:
+        return self.merged_files if self.mode == 'merge' else [file]
+
+    def pending(self) -> Iterator[Dict]:
+        """
+        Yields the files still to be written, skipping those whose .pti is already up to date with its source and
+        settings. Files are read from the settings only as they are reached.
+        """
+        for file in self.files:
+            if self.mode != 'merge' and self.cache is not None and self.cache.is_current([file], self.options(file)):
+                self.skipped += 1
+            else:
+                yield file
+
+    def decoded(self, files: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Yields the files, with the audio of sources only ffmpeg decodes already loaded. Those are decoded in
+        batches, enough to keep every ffmpeg process busy, and carry the exception in 'error' if decoding failed.
+        Other files are yielded as they are, to be loaded where they are converted.
+        """
+        if self.decoder is None:
+            yield from files
+            return
+        batch = []
+        for file in files:
+            if not self.is_decoded(file):
+                yield file
+                continue
+            batch.append(file)
+            if len(batch) == self.decoder.batch_size * self.decoder.processes:
+                yield from self.decode(batch)
+                batch = []
+        yield from self.decode(batch)
+
+    def is_decoded(self, file: Dict) -> bool:
+        """
+        Whether the file is decoded by ffmpeg, unless it already holds its audio, as a merged file does.
+        """
+        return self.decoder is not None and 'audio' not in file \
+            and file['source_extension'].lower() in FFMPEG_EXTENSIONS
+
+    def decode(self, files: List[Dict]) -> Iterator[Dict]:
+        if not files:
+            return
+        for file, pcm in zip(files, self.decoder.decode([PTI.source_path(file) for file in files])):
+            if isinstance(pcm, Exception):
+                yield dict(file, error=pcm)
+            else:
+                yield PTI.load_audio(file, Audio.from_pcm(pcm, PTI.source_path(file)), self.playback)
 
     def merge_audio(self) -> None:
-        if len(self.files) > 48:
+        """
+        Replaces the files with a copy of the first holding the merged audio, leaving the settings as they were so
+        they can be merged again.
+        """
+        # Sources only ffmpeg decodes are decoded together first, then taken back in order so the slices keep it.
+        decoded = map(PTI.raise_error, self.decode([file for file in self.files if self.is_decoded(file)]))
+        audios = [
+            next(decoded)['audio'] if self.is_decoded(file) else Audio(PTI.source_path(file), self.resample_quality)
+            for file in self.files
+        ]
+        audio, slice_points = self.merge(audios)
+        self.files = [dict(self.files[0], audio=audio, slice_points=slice_points, playback=self.playback)]
+
+    @staticmethod
+    def merge(audios: List[Audio]) -> Tuple[Audio, List[int]]:
+        """
+        Concatenates the converted audio of each slice into one preallocated buffer, returning it with the slice
+        points. The combined length is checked before anything is decoded.
+        """
+        if len(audios) > 48:
             raise CreatorTooManyMergeFilesException(
                 'Error! Too many files selected to merge into a single pti. Limited to 48 (maximum slices).'
             )
-        combined = AudioSegment.empty()
-        slice_points = [0]
-        for file in self.files:
-            audio = Audio(os.path.join(file['source_path'], file['source_file_name'] + file['source_extension']))
-            combined += audio.audio_segment
-            slice_points.append(slice_points[-1] + int(audio.audio_segment.frame_count()))
-        slice_points.pop()
-        combined_length = int(combined.frame_count())
-        slice_points = [
-            round((point / combined_length) * 65535) for point in slice_points
-        ]
-        self.files[0]['audio'] = combined
-        self.files[0]['playback'] = self.playback
-        self.files[0]['slice_points'] = slice_points
-        self.files = [self.files[0]]
+        combined_length = sum([audio.frame_count for audio in audios])
+        if round(1000 * (combined_length / 44100)) > MAX_DURATION:
+            raise CreatorSampleTooLongException(
+                "Error! Merged files are longer than 30 seconds (maximum .pti supported length)."
+            )
+        combined_data = bytearray(combined_length * 2)
+        combined_view = memoryview(combined_data)
+        slice_points = []
+        offset = 0
+        for audio in audios:
+            slice_points.append(round((offset / 2 / combined_length) * 65535))
+            for block in audio.iter_pcm():
+                combined_view[offset:offset + len(block)] = block
+                offset += len(block)
+        combined = AudioSegment(data=combined_data, sample_width=2, frame_rate=44100, channels=1)
+        return Audio.from_segment(combined), slice_points
 
-    def get_audio(self) -> None:
-        for file in self.files:
-            audio = Audio(os.path.join(file['source_path'], file['source_file_name'] + file['source_extension']))
-            file['audio'] = audio.audio_segment
-            if audio.loop_points != [0, 0]:
-                file['loop_points'] = audio.loop_points
-            if self.playback == 'dynamic':
-                file['playback'] = 'forward-loop' if 'loop_points' in file else 'one-shot'
-            else:
-                file['playback'] = self.playback
+    @staticmethod
+    def load_file(file: Dict, playback: str, resample_quality: str = 'fast', preload: bool = False) -> Dict:
+        """
+        Returns a copy of the file dict with its audio opened and playback resolved. The source PCM is only read when
+        the copy is written, and released with it, unless preload reads the whole source up front.
+        """
+        audio = Audio(PTI.source_path(file), resample_quality, preload)
+        return PTI.load_audio(file, audio, playback)
+
+    @staticmethod
+    def load_audio(file: Dict, audio: Audio, playback: str) -> Dict:
+        """
+        Returns a copy of the file dict holding already opened audio, with its loop points and playback resolved.
+        """
+        file = dict(file)
+        file['audio'] = audio
+        PTI.check_duration(file, audio.header_duration)
+        if audio.loop_points != [0, 0]:
+            file['loop_points'] = audio.loop_points
+        if playback == 'dynamic':
+            file['playback'] = 'forward-loop' if 'loop_points' in file else 'one-shot'
+        else:
+            file['playback'] = playback
+        return file
 
     def create(self) -> None:
-        for file in self.files:
-            if len(file['audio']) > 30000:
-                raise CreatorSampleTooLongException(
-                    f"Error! File "
-                    f"{os.path.join(file['source_path'], file['source_file_name'] + file['source_extension'])} "
-                    f"is longer than 30 seconds (maximum .pti supported length)."
-                )
-            sample_length = self.get_sample_length(audio=file['audio'])
+        try:
+            if self.parallel:
+                self.create_parallel()
+                return
+            for file in self.decoded(self.pending()):
+                if 'audio' in file or 'error' in file:
+                    self.write_file(PTI.raise_error(file))
+                else:
+                    self.write_file(self.load_file(file, self.playback, self.resample_quality))
+                self.record(file)
+        finally:
+            if self.cache is not None:
+                self.cache.save()
+
+    def record(self, file: Dict) -> None:
+        if self.cache is not None:
+            self.cache.record(self.sources(file), self.options(file))
+
+    def create_parallel(self) -> None:
+        """
+        Converts the batch in a pool of worker processes. Output names are already fixed per file by Settings,
+        so the result does not depend on completion order. Files are submitted as they are reached, with at most
+        IN_FLIGHT_PER_JOB per worker waiting, so memory does not grow with the batch. Failures are collected and
+        reported together once every file has been attempted.
+        """
+        in_flight: Deque[Tuple[Dict, Future]] = deque()
+        errors = []
+        attempted = 0
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            for file in self.decoded(self.pending()):
+                if 'audio' in file or 'error' in file:
+                    # Decoded by ffmpeg already, so only the header and PCM are left to write.
+                    attempted += 1
+                    try:
+                        self.write_file(PTI.raise_error(file))
+                        self.record(file)
+                    except Exception as exception:  # pylint: disable=broad-except
+                        errors.append(self.failure(file, exception))
+                    continue
+                if len(in_flight) >= self.jobs * IN_FLIGHT_PER_JOB:
+                    self.collect(*in_flight.popleft(), errors)
+                in_flight.append((file, executor.submit(
+                    convert_file, file, self.playback, self.resample_quality, profiling.profiler is not None
+                )))
+                attempted += 1
+            while in_flight:
+                self.collect(*in_flight.popleft(), errors)
+        if errors:
+            raise PTI.batch_error(errors, attempted)
+
+    def collect(self, file: Dict, future: Future, errors: List[str]) -> None:
+        """
+        Waits for a file submitted to the pool, recording it if it was written and its error otherwise.
+        """
+        exception = future.exception()
+        if exception is None:
+            if future.result() is not None and profiling.profiler is not None:
+                profiling.profiler.merge(future.result())
+            self.record(file)
+        else:
+            errors.append(self.failure(file, exception))
+
+    @staticmethod
+    def source_path(file: Dict) -> str:
+        return os.path.join(file['source_path'], file['source_file_name'] + file['source_extension'])
+
+    @staticmethod
+    def raise_error(file: Dict) -> Dict:
+        """
+        Raises the error a file failed to decode with, if it did.
+        """
+        if 'error' in file:
+            raise file['error']
+        return file
+
+    @staticmethod
+    def failure(file: Dict, exception: Exception) -> str:
+        return f"{PTI.source_path(file)}: {exception}"
+
+    @staticmethod
+    def batch_error(errors: List[str], attempted: int) -> CreatorBatchException:
+        """
+        The exception reporting every file of a batch that failed to convert, one per line.
+        """
+        return CreatorBatchException(
+            f"Error! {len(errors)} of {attempted} files failed to convert:\n" + "\n".join(errors)
+        )
+
+    @staticmethod
+    def check_duration(file: Dict, duration: int) -> None:
+        if duration > MAX_DURATION:
+            raise CreatorSampleTooLongException(
+                f"Error! File "
+                f"{PTI.source_path(file)} "
+                f"is longer than 30 seconds (maximum .pti supported length)."
+            )
+
+    @staticmethod
+    def write_file(file: Dict) -> None:
+        with profiling.stage('write', PTI.source_path(file)):
+            header = PTI.header(file)
+            os.makedirs(file['destination_path'], exist_ok=True)
+            with open(PTI.destination(file), mode='wb') as pti_file:
+                pti_file.write(header.data_bytes)
+                file['audio'].write_pcm(pti_file)
+
+    @staticmethod
+    def write_stream(file: Dict, stream: BinaryIO) -> None:
+        """
+        Writes a loaded file as a .pti to a writable stream, such as an open file or io.BytesIO.
+        """
+        header = PTI.header(file)
+        stream.write(header.data_bytes)
+        file['audio'].write_pcm(stream)
+
+    @staticmethod
+    def destination(file: Dict) -> str:
+        return os.path.join(file['destination_path'], file['destination_file_name'] + file['destination_extension'])
+
+    @staticmethod
+    def header(file: Dict) -> Header:
+        """
+        Builds and packs the header of a loaded file, checking its converted length.
+        """
+        with profiling.stage('header', PTI.source_path(file)):
+            PTI.check_duration(file, file['audio'].duration)
+            sample_length = PTI.get_sample_length(duration=file['audio'].duration)
             settings = {
                 'sample_length': sample_length,
                 'instrument_name': file['instrument_name'],
@@ -70,21 +323,21 @@ class PTI:
                 settings['loop_start'] = file['loop_points'][0]
                 settings['loop_end'] = file['loop_points'][1]
             if 'slice_points' in file:
-                settings = self.set_header_slice_points(settings=settings, slice_points=file['slice_points'])
+                settings = PTI.set_header_slice_points(settings=settings, slice_points=file['slice_points'])
             header = Header(settings)
-            pti_data = header.data_bytes
-            wav_bytes = file['audio'].raw_data
-            pti_data.extend(wav_bytes)
-            with open(os.path.join(
-                    file['destination_path'],
-                    file['destination_file_name'] +
-                    file['destination_extension']
-            ), mode='wb') as pti_file:
-                pti_file.write(pti_data)
+            header.data_bytes  # pylint: disable=pointless-statement
+            return header
+
+    @staticmethod
+    def read(path: str) -> Instrument:
+        """
+        Opens an existing .pti file. Its header is read on first use, its PCM only if asked for.
+        """
+        return Instrument(path)
 
     @staticmethod
-    def get_sample_length(audio: AudioSegment) -> int:
-        return round((len(audio) / 1000) * 44100)
+    def get_sample_length(duration: int) -> int:
+        return round((duration / 1000) * 44100)
 
     @staticmethod
     def set_header_slice_points(settings: Dict, slice_points: List[int]) -> Dict:
@@ -0,0 +1,318 @@
+import io
+import multiprocessing
+import pathlib
+import re
+import threading
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+from polyend_tracker_pti_creator import api
+from polyend_tracker_pti_creator.utils.exceptions import (
+    CreatorBatchException,
+    CreatorModeInvalidException,
+    CreatorPlaybackInvalidException,
+    CreatorRequestInvalidException,
+    CreatorResampleQualityInvalidException,
+)
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+from polyend_tracker_pti_creator.utils.settings import MODES, clean_instrument_name
+
+# Requests converted or waiting for a worker at once, per worker, unless set.
+REQUESTS_PER_JOB = 2
+# Bytes read at a time when discarding the body of a rejected request.
+DISCARD_BLOCK = 65536
+# Characters that would break out of the Content-Disposition header or a zip entry name.
+UNSAFE_FILE_NAME = re.compile(r'[\x00-\x1f\x7f"/\\]')
+INVALID_REQUEST_EXCEPTIONS = (
+    CreatorModeInvalidException,
+    CreatorPlaybackInvalidException,
+    CreatorRequestInvalidException,
+    CreatorResampleQualityInvalidException,
+)
+
+
+class Metrics:
+    """
+    Request and worker queue counters, rendered in the Prometheus text format.
+    """
+
+    def __init__(self, jobs: int, max_requests: int) -> None:
+        self.lock = threading.Lock()
+        self.jobs = jobs
+        self.max_requests = max_requests
+        self.requests: Counter = Counter()
+        self.in_flight = 0
+        self.files_pending = 0
+        self.files_converted = 0
+        self.files_failed = 0
+        self.conversion_seconds = 0.0
+
+    def add(self, name: str, value: float = 1) -> None:
+        with self.lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def response(self, code: int) -> None:
+        with self.lock:
+            self.requests[code] += 1
+
+    def render(self) -> str:
+        with self.lock:
+            lines = [
+                '# HELP pti_requests_total Conversion requests answered, by status code.',
+                '# TYPE pti_requests_total counter',
+                *[f'pti_requests_total{{code="{code}"}} {count}' for code, count in sorted(self.requests.items())],
+                '# HELP pti_requests_in_flight Requests being converted or waiting for a worker.',
+                '# TYPE pti_requests_in_flight gauge',
+                f'pti_requests_in_flight {self.in_flight}',
+                '# HELP pti_requests_max Requests accepted at once before answering 503.',
+                '# TYPE pti_requests_max gauge',
+                f'pti_requests_max {self.max_requests}',
+                '# HELP pti_files_pending Files submitted to the worker pool and not yet converted.',
+                '# TYPE pti_files_pending gauge',
+                f'pti_files_pending {self.files_pending}',
+                '# HELP pti_files_converted_total Files converted.',
+                '# TYPE pti_files_converted_total counter',
+                f'pti_files_converted_total {self.files_converted}',
+                '# HELP pti_files_failed_total Files that failed to convert.',
+                '# TYPE pti_files_failed_total counter',
+                f'pti_files_failed_total {self.files_failed}',
+                '# HELP pti_conversion_seconds_total Time from submitting files to the pool until they were converted.',
+                '# TYPE pti_conversion_seconds_total counter',
+                f'pti_conversion_seconds_total {self.conversion_seconds:.6f}',
+                '# HELP pti_workers Worker processes in the pool.',
+                '# TYPE pti_workers gauge',
+                f'pti_workers {self.jobs}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+class Server(ThreadingHTTPServer):
+    """
+    HTTP conversion service. Requests are read in threads and their files converted in a bounded pool of worker
+    processes. At most max_requests requests are accepted at once; further requests are answered with 503 and a
+    Retry-After header straight away rather than queued, so a burst of uploads cannot exhaust memory.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+            self,
+            address: Tuple[str, int],
+            jobs: int,
+            max_requests: int = None,
+            max_upload_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        super().__init__(address, Handler)
+        max_requests = max_requests or jobs * REQUESTS_PER_JOB
+        # Workers are started from a clean interpreter rather than forked from this threaded process.
+        self.executor = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('spawn'))
+        self.slots = threading.BoundedSemaphore(max_requests)
+        self.max_upload_bytes = max_upload_bytes
+        self.metrics = Metrics(jobs, max_requests)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
+
+    def convert(self, sources: List[Tuple[str, bytes]], options: Dict) -> List[Tuple[str, bytes]]:
+        """
+        Converts the uploaded wave files, named as the command line would name them, and returns the .pti files.
+        In merge mode the sources are merged into a single .pti.
+        """
+        stems = [pathlib.Path(file_name).stem for file_name, _ in sources]
+        file_name = options['file_name'].replace('.pti', '') if options['file_name'] else None
+        instrument_name = options['instrument_name'] or file_name
+        arguments = {'playback': options['playback'], 'resample_quality': options['resample_quality']}
+        if options['mode'] == 'merge':
+            jobs = [(
+                stems[0],
+                file_name or stems[0],
+                self.executor.submit(
+                    api.merge, [data for _, data in sources],
+                    instrument_name=instrument_name or stems[0], name=stems[0], **arguments
+                ),
+            )]
+        else:
+            batch = len(sources) > 1
+            jobs = []
+            for index, stem in enumerate(stems):
+                number = index + 1 if batch else None
+                jobs.append((
+                    stem,
+                    f"{file_name}{number or ''}" if file_name else stem,
+                    self.executor.submit(
+                        api.convert, sources[index][1],
+                        instrument_name=clean_instrument_name(
+                            instrument_name or stem, number if instrument_name else None
+                        ),
+                        name=stem, **arguments
+                    ),
+                ))
+        return self.collect(jobs)
+
+    def collect(self, jobs: List[Tuple[str, str, Future]]) -> List[Tuple[str, bytes]]:
+        """
+        Waits for every file submitted, reporting the failures together as a batch does.
+        """
+        started = time.perf_counter()
+        self.metrics.add('files_pending', len(jobs))
+        outputs = []
+        errors = []
+        for stem, destination_name, future in jobs:
+            exception = future.exception()
+            self.metrics.add('files_pending', -1)
+            if exception is None:
+                self.metrics.add('files_converted')
+                outputs.append((destination_name + '.pti', future.result()))
+            else:
+                self.metrics.add('files_failed')
+                errors.append(f"{stem}: {exception}")
+        self.metrics.add('conversion_seconds', time.perf_counter() - started)
+        if errors:
+            raise PTI.batch_error(errors, len(jobs))
+        return outputs
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    POST /convert converts the wave files uploaded as multipart/form-data, or a single wave file sent as the
+    request body, with options given as query parameters named as the command line arguments. A single .pti is
+    returned as is and several as a zip. GET /metrics returns the service metrics.
+    """
+
+    server: Server
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        if urlsplit(self.path).path != '/metrics':
+            self.send_text(404, 'Error! Not found.')
+            return
+        self.send_data(200, 'text/plain; version=0.0.4', self.server.metrics.render().encode())
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        url = urlsplit(self.path)
+        if url.path != '/convert':
+            self.close_connection = True
+            self.send_text(404, 'Error! Not found.')
+            return
+        if self.headers.get('Content-Length') is None:
+            self.close_connection = True
+            self.send_text(411, 'Error! Content-Length is required.')
+            return
+        try:
+            length = int(self.headers['Content-Length'])
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self.send_text(400, 'Error! Content-Length must be a whole number of bytes.')
+            return
+        if length > self.server.max_upload_bytes:
+            self.close_connection = True
+            self.send_text(413, f'Error! Uploads are limited to {self.server.max_upload_bytes} bytes.')
+            return
+        if not self.server.slots.acquire(blocking=False):
+            self.discard(length)
+            self.send_text(503, 'Error! Too many conversions in progress, try again shortly.', {'Retry-After': '1'})
+            return
+        self.server.metrics.add('in_flight')
+        try:
+            body = self.rfile.read(length)
+            outputs = self.server.convert(self.sources(body), self.options(parse_qs(url.query)))
+        except INVALID_REQUEST_EXCEPTIONS as exception:
+            self.send_text(400, str(exception))
+            return
+        except CreatorBatchException as exception:
+            self.send_text(422, str(exception))
+            return
+        finally:
+            self.server.metrics.add('in_flight', -1)
+            self.server.slots.release()
+        if len(outputs) == 1:
+            file_name, data = outputs[0]
+            self.send_data(200, 'application/octet-stream', data, file_name)
+            return
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zip_file:
+            for file_name, data in outputs:
+                zip_file.writestr(file_name, data)
+        self.send_data(200, 'application/zip', archive.getbuffer(), 'pti.zip')
+
+    @staticmethod
+    def options(query: Dict[str, List[str]]) -> Dict:
+        def option(name: str) -> str:
+            return query.get(name, [''])[-1]
+
+        mode = option('mode') or 'normal'
+        if mode not in MODES:
+            raise CreatorModeInvalidException("Error! Gave an invalid mode. Valid values are 'normal' and 'merge'.")
+        options = {
+            'mode': mode,
+            'playback': option('playback') or ('beat-slice' if mode == 'merge' else 'dynamic'),
+            'instrument_name': option('instrument-name'),
+            'file_name': Handler.check_file_name(option('file-name')),
+            'resample_quality': option('resample-quality') or 'fast',
+        }
+        api.check_options(options['playback'], options['resample_quality'])
+        return options
+
+    def sources(self, body: bytes) -> List[Tuple[str, bytes]]:
+        content_type = self.headers.get('Content-Type', '')
+        if not content_type.startswith('multipart/'):
+            if not body:
+                raise CreatorRequestInvalidException("Error! No .wav file uploaded.")
+            return [('upload.wav', body)]
+        message = BytesParser(policy=policy.HTTP).parsebytes(
+            b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+        )
+        sources = [
+            (Handler.check_file_name(part.get_filename()), part.get_payload(decode=True))
+            for part in message.iter_parts()
+            if part.get_filename()
+        ]
+        if not sources:
+            raise CreatorRequestInvalidException("Error! No .wav files uploaded.")
+        return sources
+
+    @staticmethod
+    def check_file_name(file_name: str) -> str:
+        """
+        Rejects file names with control characters, quotes or path separators, which are sent back in the response.
+        """
+        if UNSAFE_FILE_NAME.search(file_name):
+            raise CreatorRequestInvalidException(
+                "Error! File names cannot contain control characters, quotes, slashes or backslashes."
+            )
+        return file_name
+
+    def discard(self, length: int) -> None:
+        """
+        Reads and drops a request body, so the client can read the response once it has sent it.
+        """
+        while length > 0:
+            block = self.rfile.read(min(length, DISCARD_BLOCK))
+            if not block:
+                break
+            length -= len(block)
+
+    def send_text(self, code: int, text: str, headers: Dict[str, str] = None) -> None:
+        self.send_data(code, 'text/plain; charset=utf-8', (text + '\n').encode(), headers=headers)
+
+    def send_data(self, code: int, content_type: str, data, file_name: str = None, headers: Dict = None) -> None:
+        if urlsplit(self.path).path == '/convert':
+            self.server.metrics.response(code)
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        if file_name:
+            self.send_header('Content-Disposition', f'attachment; filename="{file_name}"')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
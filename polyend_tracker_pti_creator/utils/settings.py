@@ -1,15 +1,20 @@
-from typing import List, Dict
+from typing import Dict, Iterator, Optional
 from argparse import Namespace
 import os
 import re
 import pathlib
+from itertools import chain, islice
 from lazy_property import LazyProperty
+from polyend_tracker_pti_creator.utils import profiling
+from polyend_tracker_pti_creator.utils.discovery import FFMPEG_EXTENSIONS, SOURCE_EXTENSIONS, LazySequence, discover
 from polyend_tracker_pti_creator.utils.exceptions import (
     CreatorSourceMissingException,
     CreatorDestinationInvalidException,
     CreatorNoSourceWavFilesException,
     CreatorModeInvalidException,
     CreatorPlaybackInvalidException,
+    CreatorJobsInvalidException,
+    CreatorResampleQualityInvalidException,
 )
 
 MODES = ['normal', 'merge']
@@ -24,29 +29,45 @@ PLAYBACK_TYPES = [
     'granular',
     'dynamic',
 ]
+RESAMPLE_QUALITIES = ['fast', 'balanced', 'best']
+
+
+def clean_instrument_name(name: str, number: Optional[int] = None) -> str:
+    """
+    Strips the characters the Tracker cannot display from an instrument name and trims it to 32 characters,
+    keeping room for the number of a file in a batch.
+    """
+    name = re.sub(r'[^a-zA-Z0-9@ +-]', '', name)
+    return f"{name[0:32 - len(str(number))]}{number}" if number else name[0:32]
+
+
+def parse_jobs(jobs) -> int:
+    """
+    The number of worker processes given, or one per CPU if not given.
+    """
+    if not jobs:
+        return os.cpu_count() or 1
+    if not str(jobs).isdigit() or int(jobs) < 1:
+        raise CreatorJobsInvalidException(
+            "Error! Gave an invalid number of jobs. Valid values are whole numbers of 1 or more."
+        )
+    return int(jobs)
 
 
 class Settings:
     def __init__(self, args: Namespace) -> None:
         self.args = args
-        for index, file in enumerate(self.files):
-            file['destination_path'] = self.destination
-            file['destination_file_name'] = f"{self.file_name.replace('.pti', '')}" \
-                                            f"{index + 1 if self.batch and self.mode != 'merge' else ''}" \
-                if self.file_name else file['source_file_name']
-            file['destination_extension'] = '.pti'
-            if self.instrument_name:
-                base_instrument_name = self.instrument_name
-            else:
-                base_instrument_name = file['source_file_name']
-            base_instrument_name = re.sub(r'[^a-zA-Z0-9@ +-]', '', base_instrument_name)
-            file['instrument_name'] = f"{base_instrument_name[0:32 - len(str(index + 1))]}{index + 1}" \
-                if self.batch and self.instrument_name and self.mode != 'merge' else base_instrument_name[0:32]
-
         self.settings = {
             "files": self.files,
+            "destination": self.destination,
             "mode": self.mode,
             "playback": self.playback,
+            "jobs": self.jobs,
+            "resample_quality": self.resample_quality,
+            "incremental": bool(self.args.incremental),
+            "overlapped": bool(self.args.overlapped),
+            "profile": self.args.profile,
+            "ffmpeg": bool(self.args.ffmpeg),
         }
 
     @LazyProperty
@@ -100,27 +121,60 @@ class Settings:
         return os.path.basename(self.source) if os.path.isfile(self.source) else None
 
     @LazyProperty
-    def files(self) -> List[Dict[str, str]]:
-        source_files = [self.source]
-        if not os.path.isfile(self.source):
-            source_files = os.listdir(self.source)
-            source_files.sort()
-            source_files = [os.path.join(self.source, file) for file in source_files]
-        files = [
-            {
-                'source_path': os.path.dirname(file),
-                'source_file_name': pathlib.Path(os.path.basename(file)).stem,
-                'source_extension': pathlib.Path(os.path.basename(file)).suffix
-            } for file in source_files if pathlib.Path(os.path.basename(file)).suffix.lower() == '.wav'
-        ]
-
+    def files(self) -> LazySequence:
+        """
+        The source files with their destinations, read lazily as the batch is processed so that converting the first
+        file does not wait for the whole source tree to be listed.
+        """
+        files = LazySequence(self.iter_files())
         if not files:
             raise CreatorNoSourceWavFilesException(
-                "Error! No .wav files selected. Currently only .wav files supported. "
-                "If you're trying to use non-wav files, please convert to .wav then try again."
+                "Error! No .wav or .aiff files selected. Currently only .wav and .aiff files supported. "
+                "If you're trying to use other files, please convert to .wav then try again."
             )
         return files
 
+    def iter_files(self) -> Iterator[Dict[str, str]]:
+        source_files = profiling.timed(discover(
+            self.source,
+            recursive=bool(self.args.recursive),
+            include=self.args.include,
+            exclude=self.args.exclude,
+            extensions=SOURCE_EXTENSIONS + FFMPEG_EXTENSIONS if self.args.ffmpeg else SOURCE_EXTENSIONS,
+        ), 'discovery')
+        # Whether more than one file is selected, found without listing the rest of the source tree.
+        first_files = list(islice(source_files, 2))
+        batch = len(first_files) > 1
+        for index, source_file in enumerate(chain(first_files, source_files)):
+            file = {
+                'source_path': os.path.dirname(source_file),
+                'source_file_name': pathlib.Path(os.path.basename(source_file)).stem,
+                'source_extension': pathlib.Path(os.path.basename(source_file)).suffix
+            }
+            file['destination_path'] = self.destination_path(file['source_path'])
+            file['destination_file_name'] = f"{self.file_name.replace('.pti', '')}" \
+                                            f"{index + 1 if batch and self.mode != 'merge' else ''}" \
+                if self.file_name else file['source_file_name']
+            file['destination_extension'] = '.pti'
+            if self.instrument_name:
+                base_instrument_name = self.instrument_name
+            else:
+                base_instrument_name = file['source_file_name']
+            file['instrument_name'] = clean_instrument_name(
+                base_instrument_name,
+                index + 1 if batch and self.instrument_name and self.mode != 'merge' else None,
+            )
+            yield file
+
+    def destination_path(self, source_path: str) -> str:
+        """
+        Mirrors the source subfolder of a file under the destination when converting a tree in normal mode.
+        """
+        if self.mode == 'merge' or os.path.isfile(self.source):
+            return self.destination
+        relative_path = os.path.relpath(source_path, self.source)
+        return self.destination if relative_path == os.curdir else os.path.join(self.destination, relative_path)
+
     @LazyProperty
     def playback(self) -> str:
         playback = self.args.playback
@@ -138,5 +192,15 @@ class Settings:
         return playback
 
     @LazyProperty
-    def batch(self) -> bool:
-        return len(self.files) > 1
+    def jobs(self) -> int:
+        return parse_jobs(self.args.jobs)
+
+    @LazyProperty
+    def resample_quality(self) -> str:
+        resample_quality = self.args.resample_quality
+        resample_quality = resample_quality if resample_quality else 'fast'
+        if resample_quality not in RESAMPLE_QUALITIES:
+            raise CreatorResampleQualityInvalidException(
+                "Error! Gave an invalid resample quality. Valid values are 'fast', 'balanced' and 'best'."
+            )
+        return resample_quality
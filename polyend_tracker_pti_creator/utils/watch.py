@@ -0,0 +1,204 @@
+import abc
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from polyend_tracker_pti_creator.utils.discovery import SOURCE_EXTENSIONS, discover
+
+# Seconds without any change to a source before a burst of changes is converted.
+SETTLE_SECONDS = 1.0
+# Seconds between scans of the source tree when inotify is not available.
+POLL_SECONDS = 1.0
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+READ_SIZE = 65536
+
+
+class Watcher(abc.ABC):
+    """
+    Reports the source files under a directory that are created, modified, moved or deleted.
+    """
+
+    name = ''
+
+    def __init__(self, source: str, recursive: bool = False, extensions: Optional[List[str]] = None) -> None:
+        self.source = source
+        self.extensions = extensions or SOURCE_EXTENSIONS
+        # A single source file is watched through its directory.
+        self.file = os.path.abspath(source) if os.path.isfile(source) else None
+        self.root = (os.path.dirname(source) or os.curdir) if self.file else source
+        self.recursive = recursive
+
+    def relevant(self, path: str) -> bool:
+        if self.file and os.path.abspath(path) != self.file:
+            return False
+        return os.path.splitext(path)[1].lower() in self.extensions
+
+    @abc.abstractmethod
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        Waits up to timeout seconds, or until there is a change if timeout is None, and returns the changed paths.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher(Watcher):
+    """
+    Watches with Linux inotify through libc, so the kernel reports changes and nothing is scanned while the tree
+    is idle. Subdirectories created while watching are watched too when recursive.
+    """
+
+    name = 'inotify'
+
+    def __init__(self, source: str, recursive: bool = False, extensions: Optional[List[str]] = None) -> None:
+        super().__init__(source, recursive, extensions)
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.directories: Dict[int, str] = {}
+        try:
+            self.add_directory(self.root)
+        except OSError:
+            self.close()
+            raise
+
+    def add_directory(self, directory: str) -> List[str]:
+        """
+        Watches directory, and its subdirectories when recursive. Returns the source files already in them, which
+        may have been written before the watch was added.
+        """
+        descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if descriptor < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+        self.directories[descriptor] = directory
+        found = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if self.recursive:
+                        found.extend(self.add_directory(entry.path))
+                elif self.relevant(entry.path):
+                    found.append(entry.path)
+        return found
+
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        data = os.read(self.fd, READ_SIZE)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so report the whole tree as changed.
+                changed.add(self.root)
+                continue
+            if mask & IN_IGNORED:
+                self.directories.pop(descriptor, None)
+                continue
+            if descriptor not in self.directories:
+                continue
+            path = os.path.join(self.directories[descriptor], os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        changed.update(self.add_directory(path))
+                    except OSError:
+                        pass
+            elif self.relevant(path):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher(Watcher):
+    """
+    Watches by listing the source tree every poll_seconds and comparing the size and mtime of each source file.
+    """
+
+    name = 'polling'
+
+    def __init__(
+            self,
+            source: str,
+            recursive: bool = False,
+            extensions: Optional[List[str]] = None,
+            poll_seconds: float = POLL_SECONDS,
+    ) -> None:
+        super().__init__(source, recursive, extensions)
+        self.poll_seconds = poll_seconds
+        self.snapshot = self.scan()
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for path in discover(self.source, recursive=self.recursive, extensions=self.extensions):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.poll_seconds if deadline is None else min(self.poll_seconds, deadline - time.monotonic())
+            if wait > 0:
+                time.sleep(wait)
+            snapshot = self.scan()
+            changed = {
+                path for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+
+def open_watcher(source: str, recursive: bool = False, extensions: Optional[List[str]] = None) -> Watcher:
+    """
+    Watches with inotify where the OS supports it, otherwise by polling.
+    """
+    try:
+        return InotifyWatcher(source, recursive, extensions)
+    except (OSError, AttributeError):
+        return PollingWatcher(source, recursive, extensions)
+
+
+def bursts(watcher: Watcher, settle: float = SETTLE_SECONDS) -> Iterator[Set[str]]:
+    """
+    Yields the paths changed in each burst of changes, once no source has changed for settle seconds. Files still
+    being written keep changing, so they are not converted half written, and hundreds of files landing together
+    are converted as one batch.
+    """
+    while True:
+        changed = watcher.changes()
+        while True:
+            more = watcher.changes(settle)
+            if not more:
+                break
+            changed |= more
+        yield changed
@@ -7,7 +7,7 @@ import setuptools.command.build_py
 import setuptools.command.install
 from setuptools import setup
 
-sources = ["./setup.py", "./polyend_tracker_pti_creator", "./tests"]
+sources = ["./setup.py", "./polyend_tracker_pti_creator", "./tests", "./benchmarks"]
 
 
 class PylintCommand(distutils.cmd.Command):
@@ -100,7 +100,11 @@ setup(
     ],
     python_requires=">=3",
     entry_points={
-        "console_scripts": ["pet-pti-creator=polyend_tracker_pti_creator.creator:main"]
+        "console_scripts": [
+            "pet-pti-creator=polyend_tracker_pti_creator.creator:main",
+            "pet-pti-index=polyend_tracker_pti_creator.indexer:main",
+            "pet-pti-serve=polyend_tracker_pti_creator.serve:main",
+        ]
     },
     cmdclass={
         "format": BlackCommand,
@@ -0,0 +1,129 @@
+"""
+Synthetic wave and AIFF files for the tests and benchmarks, generated locally so no sample files are needed.
+"""
+import os
+import struct
+import wave
+from typing import Optional, Tuple
+import numpy as np
+
+
+def write_wave(
+        path: str,
+        seconds: float,
+        frame_rate: int = 44100,
+        channels: int = 1,
+        sample_width: int = 2,
+        loop: Optional[Tuple[int, int]] = None,
+        is_float: bool = False,
+        extensible: bool = False,
+) -> str:
+    """
+    Writes a sine tone wave file of the given format and returns its path.
+    With loop, a smpl chunk holding one forward loop between those frames is appended after the data chunk.
+    With is_float the samples are 32 or 64-bit floating point, and with extensible the fmt chunk is
+    WAVE_FORMAT_EXTENSIBLE, giving the sample format as a subformat GUID.
+    """
+    frame_count = int(seconds * frame_rate)
+    time = np.arange(frame_count) / frame_rate
+    tone = np.repeat(np.sin(2 * np.pi * 440 * time), channels) * 0.5
+    peak = 2 ** (8 * sample_width - 1) - 1
+    samples = np.round(tone * peak).astype(np.int64)
+    if is_float:
+        data = tone.astype(f'<f{sample_width}').tobytes()
+    elif sample_width == 1:
+        data = (samples + 128).astype(np.uint8).tobytes()
+    elif sample_width == 3:
+        data = samples.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    else:
+        data = samples.astype(f'<i{sample_width}').tobytes()
+    if is_float or extensible:
+        write_riff(path, format_chunk(frame_rate, channels, sample_width, 3 if is_float else 1, extensible), data)
+    else:
+        with wave.open(path, 'wb') as wave_file:
+            wave_file.setnchannels(channels)
+            wave_file.setsampwidth(sample_width)
+            wave_file.setframerate(frame_rate)
+            wave_file.writeframes(data)
+    if loop is not None:
+        append_sample_chunk(path, *loop)
+    return path
+
+
+def format_chunk(frame_rate: int, channels: int, sample_width: int, format_code: int, extensible: bool) -> bytes:
+    block_align = channels * sample_width
+    content = struct.pack(
+        '<HHIIHH', 0xFFFE if extensible else format_code, channels, frame_rate, frame_rate * block_align, block_align,
+        8 * sample_width,
+    )
+    if extensible:
+        guid_tail = b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+        content += struct.pack('<HHIH', 22, 8 * sample_width, (1 << channels) - 1, format_code) + guid_tail
+    elif format_code != 1:
+        content += struct.pack('<H', 0)
+    return content
+
+
+def write_riff(path: str, fmt: bytes, data: bytes) -> None:
+    chunks = b'fmt ' + struct.pack('<I', len(fmt)) + fmt + b'data' + struct.pack('<I', len(data)) + data
+    if len(data) % 2:
+        chunks += b'\x00'
+    with open(path, 'wb') as file:
+        file.write(b'RIFF' + struct.pack('<I', 4 + len(chunks)) + b'WAVE' + chunks)
+
+
+def write_aiff(
+        path: str,
+        seconds: float,
+        frame_rate: int = 44100,
+        channels: int = 1,
+        sample_width: int = 2,
+        loop: Optional[Tuple[int, int]] = None,
+        compression_type: Optional[bytes] = None,
+) -> str:
+    """
+    Writes the same sine tone as write_wave as an AIFF file and returns its path. With a compression_type, such as
+    b'sowt' or b'fl32', an AIFC file is written instead. With loop, MARK and INST chunks hold a forward sustain loop
+    between those frames.
+    """
+    frame_count = int(seconds * frame_rate)
+    time = np.arange(frame_count) / frame_rate
+    tone = np.repeat(np.sin(2 * np.pi * 440 * time), channels) * 0.5
+    if compression_type in (b'fl32', b'fl64'):
+        data = tone.astype(f'>f{sample_width}').tobytes()
+    else:
+        samples = np.round(tone * (2 ** (8 * sample_width - 1) - 1)).astype(np.int64)
+        byte_order = '<' if compression_type == b'sowt' else '>'
+        data = samples.astype(f'{byte_order}i4').view(np.uint8).reshape(-1, 4)
+        data = (data[:, :sample_width] if byte_order == '<' else data[:, 4 - sample_width:]).tobytes()
+    exponent = 16383 + 63
+    mantissa = frame_rate
+    while mantissa < 1 << 63:
+        mantissa <<= 1
+        exponent -= 1
+    common = struct.pack('>hIh', channels, frame_count, 8 * sample_width) + struct.pack('>HQ', exponent, mantissa)
+    if compression_type is not None:
+        common += compression_type + b'\x00\x00'
+    chunks = [(b'COMM', common), (b'SSND', struct.pack('>II', 0, 0) + data)]
+    if loop is not None:
+        chunks.append((b'MARK', struct.pack('>H', 2) + struct.pack('>hIB3s', 1, loop[0], 3, b'beg')
+                       + struct.pack('>hIB3s', 2, loop[1], 3, b'end')))
+        chunks.append((b'INST', struct.pack('>6bhhhhhhh', 60, 0, 0, 127, 1, 127, 0, 1, 1, 2, 0, 0, 0)))
+    body = b''.join(
+        name + struct.pack('>I', len(content)) + content + (b'\x00' if len(content) % 2 else b'')
+        for name, content in chunks
+    )
+    form_type = b'AIFF' if compression_type is None else b'AIFC'
+    with open(path, 'wb') as file:
+        file.write(b'FORM' + struct.pack('>I', 4 + len(body)) + form_type + body)
+    return path
+
+
+def append_sample_chunk(path: str, loop_start: int, loop_end: int) -> None:
+    chunk = struct.pack('<9I6I', 0, 0, 0, 60, 0, 0, 0, 1, 0, 0, 0, loop_start, loop_end, 0, 0)
+    with open(path, 'r+b') as file:
+        file.seek(0, os.SEEK_END)
+        file.write(b'smpl' + struct.pack('<I', len(chunk)) + chunk)
+        riff_length = file.tell() - 8
+        file.seek(4)
+        file.write(struct.pack('<I', riff_length))
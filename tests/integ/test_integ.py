@@ -1,30 +1,37 @@
+import os
+import shutil
+import tempfile
 from unittest import TestCase
 from polyend_tracker_pti_creator.utils.pti.pti import PTI
+from tests.corpus import write_wave
+
 
 class TestInteg(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        shutil.copy('./tests/utils/files/tone.wav', self.directory)
+        write_wave(os.path.join(self.directory, 'ss.wav'), 2, frame_rate=48000, channels=2, sample_width=3,
+                   loop=(1000, 90000))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
     def test_integration(self) -> None:
         settings = {
             'files': [
                 {
-                    'source_path': './tests/utils/files',
-                    'source_file_name': 'tone',
-                    'source_extension': '.wav',
-                    'destination_path': './tests/utils/files',
-                    'destination_file_name': 'tone',
-                    'destination_extension': '.pti',
-                    'instrument_name': 'test'
-                },
-                {
-                    'source_path': '/Users/adriananders/polyend-tracker-pti-creator/tests/utils/files/integ',
-                    'source_file_name': 'ss',
+                    'source_path': self.directory,
+                    'source_file_name': name,
                     'source_extension': '.wav',
-                    'destination_path': '/Users/adriananders/polyend-tracker-pti-creator/tests/utils/files/integ',
-                    'destination_file_name': 'ss',
+                    'destination_path': self.directory,
+                    'destination_file_name': name,
                     'destination_extension': '.pti',
                     'instrument_name': 'test'
-                },
+                } for name in ['tone', 'ss']
             ],
             'mode': 'normal',
             'playback': 'dynamic'
         }
-        PTI(settings).create()
\ No newline at end of file
+        PTI(settings).create()
+        for name in ['tone', 'ss']:
+            self.assertTrue(os.path.getsize(os.path.join(self.directory, name + '.pti')) > 392)
@@ -0,0 +1,87 @@
+import contextlib
+import io
+import os
+import tempfile
+from unittest import TestCase
+from polyend_tracker_pti_creator import api
+from polyend_tracker_pti_creator.utils.exceptions import CreatorPlaybackInvalidException
+from polyend_tracker_pti_creator.utils.pti.header import Header
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+from tests.corpus import write_wave
+
+
+class TestApi(TestCase):
+    def write_pti(self, destination: str, names: list, mode: str, playback: str) -> bytes:
+        settings = {
+            'files': [
+                {
+                    'source_path': './tests/utils/files',
+                    'source_file_name': name,
+                    'source_extension': '.wav',
+                    'destination_path': destination,
+                    'destination_file_name': 'expected',
+                    'destination_extension': '.pti',
+                    'instrument_name': 'test',
+                }
+                for name in names
+            ],
+            'mode': mode,
+            'playback': playback,
+        }
+        PTI(settings).create()
+        with open(os.path.join(destination, 'expected.pti'), 'rb') as file:
+            return file.read()
+
+    def test_convert_matches_file(self) -> None:
+        with tempfile.TemporaryDirectory() as destination:
+            expected = self.write_pti(destination, ['tone'], 'normal', 'dynamic')
+        with open('./tests/utils/files/tone.wav', 'rb') as file:
+            data = file.read()
+        self.assertEqual(expected, api.convert(data, instrument_name='test'))
+        self.assertEqual(expected, api.convert(memoryview(data), instrument_name='test'))
+        self.assertEqual(expected, api.convert(io.BytesIO(data), instrument_name='test'))
+        self.assertEqual(expected, api.convert('./tests/utils/files/tone.wav', instrument_name='test'))
+
+    def test_convert_native_to_stream(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'native.wav')
+            write_wave(path, 0.1)
+            with open(path, 'rb') as file:
+                data = file.read()
+        destination = io.BytesIO()
+        self.assertIsNone(api.convert(data, instrument_name='native!', playback='one-shot', destination=destination))
+        content = destination.getvalue()
+        header = Header.from_bytes(content[:392])
+        self.assertEqual('native', header.fields['instrument_name'])
+        self.assertEqual(4410, header.fields['sample_length'])
+        self.assertEqual(data[-4410 * 2:], content[392:])
+
+    def test_convert_native_to_pipe(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'native.wav')
+            write_wave(path, 0.1)
+            expected = api.convert(path, playback='one-shot')
+            read_fd, write_fd = os.pipe()
+            with os.fdopen(read_fd, 'rb') as reader:
+                with os.fdopen(write_fd, 'wb') as writer:
+                    api.convert(path, playback='one-shot', destination=writer)
+                self.assertEqual(expected, reader.read())
+
+    def test_convert_is_silent(self) -> None:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            api.convert('./tests/utils/files/tone.wav')
+        self.assertEqual('', output.getvalue())
+
+    def test_merge_matches_file(self) -> None:
+        with tempfile.TemporaryDirectory() as destination:
+            expected = self.write_pti(destination, ['tone', 'tone2'], 'merge', 'beat-slice')
+        sources = []
+        for name in ['tone', 'tone2']:
+            with open(f'./tests/utils/files/{name}.wav', 'rb') as file:
+                sources.append(file.read())
+        self.assertEqual(expected, api.merge(sources, instrument_name='test'))
+
+    def test_invalid_playback(self) -> None:
+        with self.assertRaises(CreatorPlaybackInvalidException):
+            api.convert(b'', playback='reverse')
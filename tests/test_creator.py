@@ -0,0 +1,55 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from parameterized import parameterized
+from polyend_tracker_pti_creator.creator import main
+
+# Runs the CLI until it prints help or rejects its arguments, then prints which audio stack modules it imported.
+SCRIPT = """
+import json, sys
+sys.argv = ['pet-pti-creator'] + sys.argv[1:]
+from polyend_tracker_pti_creator.creator import main
+from polyend_tracker_pti_creator.utils import exceptions
+try:
+    main()
+except (SystemExit, exceptions.CreatorSourceMissingException, exceptions.CreatorModeInvalidException):
+    pass
+finally:
+    print(json.dumps(sorted(
+        name for name in sys.modules
+        if name.split('.')[0] in ('pydub', 'numpy', 'wave_chunk_parser')
+        or name.startswith('polyend_tracker_pti_creator.utils.pti')
+    )))
+"""
+
+
+class TestCreator(TestCase):
+    @parameterized.expand([
+        (['--help'],),
+        (['--source', 'missing.wav'],),
+        (['--source', './tests/utils/files/tone.wav', '--mode', 'unknown'],),
+    ])
+    def test_startup_skips_audio_stack(self, args: list) -> None:
+        output = subprocess.run([sys.executable, '-c', SCRIPT] + args, capture_output=True, text=True, check=True)
+        self.assertEqual([], json.loads(output.stdout.splitlines()[-1]))
+
+    def test_success_names_destination_root(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'renders')
+            destination = os.path.join(directory, 'instruments')
+            os.makedirs(os.path.join(source, 'drums'))
+            os.mkdir(destination)
+            shutil.copy('./tests/utils/files/tone.wav', os.path.join(source, 'drums'))
+            output = io.StringIO()
+            argv = ['pet-pti-creator', '-s', source, '-d', destination, '--recursive']
+            with patch.object(sys, 'argv', argv), contextlib.redirect_stdout(output):
+                main()
+            self.assertTrue(os.path.exists(os.path.join(destination, 'drums', 'tone.pti')))
+        self.assertIn(f"saved to {destination}.", output.getvalue())
@@ -0,0 +1,64 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from parameterized import parameterized
+from wave_chunk_parser.exceptions import (
+    InvalidHeaderException,
+)
+from polyend_tracker_pti_creator.utils.audio.aiff_file import (
+    AiffFile,
+)
+from polyend_tracker_pti_creator.utils.audio.audio import (
+    Audio,
+)
+from tests.corpus import write_aiff, write_wave
+
+
+class TestAiffFile(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_read_chunks(self) -> None:
+        aiff = AiffFile.from_file(write_aiff(self.path('loop.aif'), 0.5, 48000, 2, 3, loop=(100, 20000)))
+        self.assertEqual((2, 48000, 3, 24000), (aiff.channels, aiff.frame_rate, aiff.sample_width, aiff.frame_count))
+        self.assertTrue(aiff.is_pcm)
+        self.assertTrue(aiff.big_endian)
+        self.assertEqual((100, 20000), aiff.loop)
+        self.assertIsNone(AiffFile.from_file(write_aiff(self.path('tone.aif'), 0.1)).loop)
+        aifc = AiffFile.from_file(write_aiff(self.path('tone.aifc'), 0.1, 22050, compression_type=b'fl32'))
+        self.assertEqual(22050, aifc.frame_rate)
+        self.assertTrue(aifc.is_float)
+        self.assertFalse(aifc.is_pcm)
+
+    def test_invalid_header(self) -> None:
+        with self.assertRaises(InvalidHeaderException):
+            AiffFile(b'RIFF\x00\x00\x00\x00WAVE')
+
+    @parameterized.expand([
+        (1, 44100, 1, None),
+        (2, 44100, 1, None),
+        (2, 44100, 1, b'sowt'),
+        (3, 48000, 2, None),
+        (4, 96000, 2, b'NONE'),
+    ])
+    def test_matches_wave(self, sample_width: int, frame_rate: int, channels: int, compression_type) -> None:
+        wave_audio = Audio(write_wave(self.path('tone.wav'), 0.2, frame_rate, channels, sample_width, (10, 2000)))
+        aiff_path = write_aiff(self.path('tone.aif'), 0.2, frame_rate, channels, sample_width, (10, 2000),
+                               compression_type)
+        with patch('subprocess.Popen', side_effect=AssertionError('ffmpeg was started')):
+            aiff_audio = Audio(aiff_path)
+            self.assertEqual(wave_audio.pcm, aiff_audio.pcm)
+        self.assertEqual(wave_audio.loop_points, aiff_audio.loop_points)
+        self.assertEqual(compression_type == b'sowt', aiff_audio.is_native)
+
+    def test_float(self) -> None:
+        wave_audio = Audio(write_wave(self.path('tone.wav'), 0.2, 48000, 2, 4, is_float=True))
+        aiff_audio = Audio(write_aiff(self.path('tone.aifc'), 0.2, 48000, 2, 4, compression_type=b'fl32'))
+        self.assertEqual(wave_audio.pcm, aiff_audio.pcm)
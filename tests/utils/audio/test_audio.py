@@ -1,8 +1,12 @@
 import os
+import tempfile
 from unittest import TestCase
+from unittest.mock import patch
 from polyend_tracker_pti_creator.utils.audio.audio import (
     Audio,
+    copy_file_range,
 )
+from tests.corpus import write_wave
 
 DIR_PATH = os.path.dirname(os.path.realpath(__file__))
 
@@ -21,3 +25,52 @@ class TestAudio(TestCase):
         self.assertEqual(audio.audio_segment.frame_width, 2)
         audio2 = Audio(FILE_PATHS[1])
         self.assertEqual(audio2.loop_points, [0, 0])
+
+    def test_native_passthrough(self) -> None:
+        audio = Audio(os.path.join(DIR_PATH, "../files/test_tone.wav"))
+        self.assertTrue(audio.is_native)
+        self.assertEqual(audio.duration, 852)
+        with tempfile.TemporaryFile() as destination:
+            destination.write(b"header")
+            audio.write_pcm(destination)
+            destination.seek(0)
+            self.assertEqual(destination.read(), b"header" + bytes(audio.wave.data))
+        self.assertFalse(hasattr(audio, "_audio_segment"))
+        self.assertFalse(Audio(FILE_PATHS[0]).is_native)
+
+    def test_copy_file_range(self) -> None:
+        with tempfile.TemporaryFile() as source, tempfile.TemporaryFile() as destination:
+            source.write(b"0123456789")
+            source.flush()
+            destination.write(b"ab")
+            self.assertEqual(copy_file_range(source, destination, 3, 4), 4)
+            destination.write(b"cd")
+            destination.seek(0)
+            self.assertEqual(destination.read(), b"ab3456cd")
+
+    def test_iter_pcm(self) -> None:
+        audio = Audio(FILE_PATHS[0])
+        blocks = list(audio.iter_pcm(block_frames=4096))
+        self.assertEqual(len(blocks), 6)
+        self.assertTrue(all(len(block) <= 4096 * 2 for block in blocks))
+        self.assertEqual(audio.frame_count, 21337)
+        self.assertEqual(b''.join(blocks), audio.audio_segment.raw_data)
+        self.assertEqual(audio.duration, len(audio.audio_segment))
+
+    def test_pro_audio_formats_without_ffmpeg(self) -> None:
+        with tempfile.TemporaryDirectory() as directory, \
+                patch('subprocess.Popen', side_effect=AssertionError('ffmpeg was started')):
+            expected = Audio(write_wave(os.path.join(directory, 'int.wav'), 0.1, 48000, 2, 3)).pcm
+            for name, sample_width, is_float, extensible in [
+                ('extensible.wav', 3, False, True),
+                ('float.wav', 4, True, False),
+                ('double.wav', 8, True, True),
+            ]:
+                path = write_wave(os.path.join(directory, name), 0.1, 48000, 2, sample_width, None, is_float,
+                                  extensible)
+                audio = Audio(path)
+                self.assertTrue(audio.is_pcm)
+                self.assertEqual(audio.frame_count * 2, len(audio.pcm))
+                if not is_float:
+                    self.assertEqual(expected, audio.pcm)
+            self.assertEqual(100, audio.duration)
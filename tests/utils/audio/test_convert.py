@@ -0,0 +1,64 @@
+import os
+from unittest import TestCase
+from parameterized import parameterized
+import numpy as np
+from pydub.audio_segment import AudioSegment
+from polyend_tracker_pti_creator.utils.audio.convert import (
+    Converter,
+)
+from polyend_tracker_pti_creator.utils.audio.wave_file import (
+    WaveFile,
+)
+
+DIR_PATH = os.path.dirname(os.path.realpath(__file__))
+
+
+class TestConverter(TestCase):
+    @parameterized.expand(
+        [
+            (1, 2, 22050),
+            (2, 1, 44100),
+            (2, 2, 48000),
+            (3, 2, 96000),
+            (4, 1, 32000),
+            (2, 4, 48000),
+        ]
+    )
+    def test_matches_pydub(self, sample_width: int, channels: int, frame_rate: int) -> None:
+        data = np.random.default_rng(0).integers(0, 256, 1001 * channels * sample_width, dtype=np.uint8).tobytes()
+        signed_data = data if sample_width != 1 else bytes((value - 128) % 256 for value in data)
+        expected = AudioSegment(
+            data=signed_data,
+            sample_width=sample_width,
+            frame_rate=frame_rate,
+            channels=channels,
+        ).set_frame_rate(44100).set_channels(1).set_sample_width(2).raw_data
+        converter = Converter(frame_rate, channels, sample_width)
+        block_length = 97 * channels * sample_width
+        actual = b''.join([
+            converter.convert(data[offset:offset + block_length]) for offset in range(0, len(data), block_length)
+        ])
+        self.assertEqual(expected, actual)
+        self.assertEqual(converter.frame_count(1001) * 2, len(actual))
+
+    def test_wave_file(self) -> None:
+        wave = WaveFile.from_file(os.path.join(DIR_PATH, "../files/tone.wav"))
+        converter = Converter(wave.frame_rate, wave.channels, wave.sample_width)
+        self.assertEqual(converter.frame_count(wave.frame_count), 21337)
+        self.assertEqual(len(converter.convert(wave.data)), 21337 * 2)
+
+    @parameterized.expand([(4, 44100), (8, 48000), (4, 96000)])
+    def test_float(self, sample_width: int, frame_rate: int) -> None:
+        samples = np.random.default_rng(0).uniform(-1.2, 1.2, 2 * 1001)
+        expected = Converter(frame_rate, 2, 4).convert(
+            np.clip(np.round(samples.astype(f'<f{sample_width}').astype(np.float64) * 2 ** 31), -2 ** 31, 2 ** 31 - 1)
+            .astype('<i4').tobytes()
+        )
+        actual = Converter(frame_rate, 2, sample_width, is_float=True).convert(
+            samples.astype(f'<f{sample_width}').tobytes()
+        )
+        self.assertEqual(expected, actual)
+        clipped = np.frombuffer(Converter(44100, 1, 4, is_float=True).convert(
+            np.array([1.5, -1.5, 0.5], dtype='<f4').tobytes()
+        ), dtype='<i2')
+        self.assertEqual([32767, -32768, 16384], clipped.tolist())
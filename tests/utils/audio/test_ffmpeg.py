@@ -0,0 +1,136 @@
+import os
+import shutil
+import stat
+import sys
+import tempfile
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+from polyend_tracker_pti_creator.utils.audio.ffmpeg import FfmpegDecoder
+from polyend_tracker_pti_creator.utils.exceptions import CreatorDecodeException, FfmpegNotInstalledException
+from polyend_tracker_pti_creator.utils.pti.instrument import Instrument
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+from tests.corpus import write_wave
+
+# Stands in for ffmpeg: decodes each -i input, a 44.1 kHz mono 16-bit wave file whatever its extension, to the
+# pipe mapped to it, logging one line per process started.
+FAKE_FFMPEG = f"""#!{sys.executable}
+import os, sys, wave
+arguments = sys.argv[1:]
+inputs = [arguments[index + 1] for index, argument in enumerate(arguments) if argument == '-i']
+outputs = [int(argument[5:]) for argument in arguments if argument.startswith('pipe:')]
+with open(os.environ['FAKE_FFMPEG_LOG'], 'a') as log:
+    log.write(str(len(inputs)) + '\\n')
+for path, fd in zip(inputs, outputs):
+    if 'broken' in path:
+        sys.stderr.write('Invalid data found when processing input')
+        sys.exit(1)
+    with wave.open(path, 'rb') as source:
+        data = source.readframes(source.getnframes())
+    while data:
+        data = data[os.write(fd, data):]
+"""
+
+
+@skipUnless(os.name == 'posix', 'the fake ffmpeg is a script run through its shebang')
+class TestFfmpegDecoder(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.bin = os.path.join(self.directory, 'bin')
+        os.mkdir(self.bin)
+        executable = os.path.join(self.bin, 'ffmpeg')
+        with open(executable, 'w', encoding='utf-8') as script:
+            script.write(FAKE_FFMPEG)
+        os.chmod(executable, os.stat(executable).st_mode | stat.S_IEXEC)
+        self.log = os.path.join(self.directory, 'ffmpeg.log')
+        self.environment = patch.dict(os.environ, {
+            'PATH': self.bin + os.pathsep + os.environ.get('PATH', ''),
+            'FAKE_FFMPEG_LOG': self.log,
+        })
+        self.environment.start()
+
+    def tearDown(self) -> None:
+        self.environment.stop()
+        shutil.rmtree(self.directory)
+
+    def sources(self, count: int, extension: str = '.flac') -> list:
+        return [write_wave(os.path.join(self.directory, f'{index}{extension}'), 0.01 * (index + 1))
+                for index in range(count)]
+
+    def processes(self) -> list:
+        with open(self.log, encoding='utf-8') as log:
+            return [int(line) for line in log]
+
+    def test_batches(self) -> None:
+        paths = self.sources(5)
+        results = list(FfmpegDecoder(processes=2, batch_size=2).decode(paths))
+        self.assertEqual([441 * (index + 1) * 2 for index in range(5)], [len(result) for result in results])
+        self.assertEqual([2, 2, 1], sorted(self.processes(), reverse=True))
+
+    def test_failure_isolated(self) -> None:
+        paths = self.sources(2)
+        broken = os.path.join(self.directory, 'broken.flac')
+        shutil.copy(paths[0], broken)
+        results = list(FfmpegDecoder(batch_size=3).decode([paths[0], broken, paths[1]]))
+        self.assertEqual(882, len(results[0]))
+        self.assertIsInstance(results[1], CreatorDecodeException)
+        self.assertIn('Invalid data found', str(results[1]))
+        self.assertEqual(1764, len(results[2]))
+
+    def test_not_installed(self) -> None:
+        with self.assertRaises(FfmpegNotInstalledException):
+            list(FfmpegDecoder(executable=os.path.join(self.directory, 'missing')).decode(self.sources(1)))
+
+    def test_pti(self) -> None:
+        paths = self.sources(3, '.mp3')
+        settings = {
+            'files': [
+                {
+                    'source_path': self.directory,
+                    'source_file_name': str(index),
+                    'source_extension': '.mp3',
+                    'destination_path': self.directory,
+                    'destination_file_name': str(index),
+                    'destination_extension': '.pti',
+                    'instrument_name': 'test',
+                }
+                for index in range(len(paths))
+            ],
+            'mode': 'normal',
+            'playback': 'dynamic',
+            'ffmpeg': True,
+        }
+        PTI(settings).create()
+        self.assertEqual([3], self.processes())
+        for index in range(len(paths)):
+            instrument = Instrument(os.path.join(self.directory, f'{index}.pti'))
+            self.assertEqual(441 * (index + 1), instrument.sample_length)
+            self.assertEqual('one-shot', instrument.playback)
+
+    def test_merge_keeps_order(self) -> None:
+        write_wave(os.path.join(self.directory, '1.flac'), 0.5)
+        write_wave(os.path.join(self.directory, '2.wav'), 0.1)
+        settings = {
+            'files': [
+                {
+                    'source_path': self.directory,
+                    'source_file_name': name,
+                    'source_extension': extension,
+                    'destination_path': self.directory,
+                    'destination_file_name': 'kit',
+                    'destination_extension': '.pti',
+                    'instrument_name': 'kit',
+                }
+                for name, extension in [('1', '.flac'), ('2', '.wav')]
+            ],
+            'mode': 'merge',
+            'playback': 'beat-slice',
+            'ffmpeg': True,
+        }
+        PTI(settings).create()
+        instrument = Instrument(os.path.join(self.directory, 'kit.pti'))
+        self.assertEqual([0, 54612], instrument.slice_points)
+        with open(os.path.join(self.directory, 'kit.pti'), 'rb') as file:
+            pcm = file.read()[392:]
+        self.assertEqual(26460 * 2, len(pcm))
+        flac = next(FfmpegDecoder().decode([os.path.join(self.directory, '1.flac')]))
+        self.assertEqual(flac, pcm[:len(flac)])
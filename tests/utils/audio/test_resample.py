@@ -0,0 +1,46 @@
+from unittest import TestCase
+from parameterized import parameterized
+import numpy as np
+from polyend_tracker_pti_creator.utils.audio.resample import (
+    RESAMPLE_QUALITIES,
+    SincResampler,
+)
+
+
+class TestSincResampler(TestCase):
+    @parameterized.expand(
+        [
+            ('balanced', 48000),
+            ('balanced', 88200),
+            ('best', 96000),
+            ('best', 22050),
+        ]
+    )
+    def test_sine(self, quality: str, frame_rate: int) -> None:
+        samples = np.sin(2 * np.pi * 1000 * np.arange(frame_rate) / frame_rate) * 10000
+        resampler = SincResampler(frame_rate, 44100, **RESAMPLE_QUALITIES[quality])
+        output = np.concatenate(
+            [resampler.resample(samples[offset:offset + 4999]) for offset in range(0, len(samples), 4999)]
+            + [resampler.flush()]
+        )
+        self.assertEqual(len(output), resampler.frame_count(frame_rate))
+        expected = np.sin(2 * np.pi * 1000 * np.arange(len(output)) / 44100) * 10000
+        self.assertLess(np.abs(output - expected)[200:-200].max(), 2)
+
+    def test_blocks_match_single_pass(self) -> None:
+        samples = np.random.default_rng(0).uniform(-1, 1, 20000)
+        single = SincResampler(48000, 44100, **RESAMPLE_QUALITIES['balanced'])
+        expected = np.concatenate([single.resample(samples), single.flush()])
+        blocks = SincResampler(48000, 44100, **RESAMPLE_QUALITIES['balanced'])
+        actual = np.concatenate(
+            [blocks.resample(samples[offset:offset + 333]) for offset in range(0, len(samples), 333)]
+            + [blocks.flush()]
+        )
+        np.testing.assert_allclose(expected, actual)
+
+    def test_aliasing(self) -> None:
+        # 23 kHz is above the 44.1 kHz Nyquist frequency and must be filtered out rather than folded down.
+        samples = np.sin(2 * np.pi * 23000 * np.arange(48000) / 48000) * 10000
+        resampler = SincResampler(48000, 44100, **RESAMPLE_QUALITIES['best'])
+        output = np.concatenate([resampler.resample(samples), resampler.flush()])
+        self.assertLess(np.abs(output[1000:-1000]).max(), 1)
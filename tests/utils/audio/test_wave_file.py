@@ -0,0 +1,98 @@
+import io
+import os
+import struct
+import tempfile
+import wave
+from unittest import TestCase
+from wave_chunk_parser.exceptions import (
+    InvalidHeaderException,
+)
+from polyend_tracker_pti_creator.utils.audio.wave_file import (
+    WaveFile,
+)
+from tests.corpus import write_wave
+
+DIR_PATH = os.path.dirname(os.path.realpath(__file__))
+
+
+class TestWaveFile(TestCase):
+    def test_read_chunks(self) -> None:
+        wave = WaveFile.from_file(os.path.join(DIR_PATH, "../files/test_tone.wav"))
+        self.assertTrue(wave.is_pcm)
+        self.assertEqual(wave.channels, 1)
+        self.assertEqual(wave.frame_rate, 44100)
+        self.assertEqual(wave.sample_width, 2)
+        self.assertEqual(wave.frame_count, 37586)
+        self.assertEqual(len(wave.data), 37586 * 2)
+        self.assertEqual(wave.sample_chunk.number_of_sample_loops, 1)
+        self.assertEqual(wave.sample_chunk.first_loop_start, 37485)
+        self.assertEqual(wave.sample_chunk.first_loop_end, 37585)
+
+    def test_no_sample_chunk(self) -> None:
+        wave = WaveFile.from_file(os.path.join(DIR_PATH, "../files/tone2.wav"))
+        self.assertIsNone(wave.sample_chunk)
+        self.assertEqual(wave.channels, 2)
+        self.assertEqual(wave.frame_count, 23224)
+
+    def test_invalid_header(self) -> None:
+        with self.assertRaises(InvalidHeaderException):
+            WaveFile(b"NOT A WAVE FILE")
+
+    @staticmethod
+    def wave_with_metadata(frame_count: int) -> bytes:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wave_file:
+            wave_file.setnchannels(1)
+            wave_file.setsampwidth(2)
+            wave_file.setframerate(44100)
+            wave_file.writeframes(bytes(frame_count * 2))
+        acid = struct.pack("<IHHfIHHf", 1, 60, 0x8000, 0.0, 8, 4, 4, 120.0)
+        info = b"INFO" + b"INAM" + struct.pack("<I", 5) + b"loop\x00\x00"
+        data = buffer.getvalue() + b"acid" + struct.pack("<I", len(acid)) + acid \
+            + b"LIST" + struct.pack("<I", len(info)) + info
+        return data[:4] + struct.pack("<I", len(data) - 8) + data[8:]
+
+    def test_metadata_chunks(self) -> None:
+        wave_file = WaveFile(self.wave_with_metadata(10))
+        self.assertEqual(wave_file.tempo, 120.0)
+        self.assertEqual(wave_file.beats, 8)
+        self.assertEqual(wave_file.root_note, 60)
+        self.assertEqual(wave_file.info, {"INAM": "loop"})
+        self.assertEqual(wave_file.frame_count, 10)
+
+    def test_from_stream_skips_data(self) -> None:
+        data = self.wave_with_metadata(1000000)
+        stream = io.BytesIO(data)
+        read_lengths = []
+        original_read = stream.read
+        stream.read = lambda length=-1: read_lengths.append(length) or original_read(length)
+        wave_file = WaveFile.from_stream(stream)
+        self.assertLess(sum(read_lengths), 200)
+        self.assertEqual(wave_file.data_offset, 44)
+        self.assertEqual(wave_file.data_length, 2000000)
+        self.assertEqual(wave_file.tempo, 120.0)
+        with self.assertRaises(ValueError):
+            wave_file.data  # pylint: disable=pointless-statement
+
+    def test_data_mapped_on_use(self) -> None:
+        wave_file = WaveFile.from_file(os.path.join(DIR_PATH, "../files/test_tone.wav"))
+        self.assertIsNone(wave_file._buffer)  # pylint: disable=protected-access
+        self.assertEqual(len(wave_file.data), 37586 * 2)
+
+    def test_extensible_and_float_formats(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_wave(os.path.join(directory, 'float.wav'), 0.01, sample_width=4, is_float=True)
+            wave_file = WaveFile.from_file(path)
+            self.assertTrue(wave_file.is_float)
+            self.assertFalse(wave_file.is_pcm)
+            path = write_wave(os.path.join(directory, 'extensible.wav'), 0.01, channels=2, sample_width=3,
+                              extensible=True)
+            wave_file = WaveFile.from_file(path)
+            self.assertTrue(wave_file.is_pcm)
+            self.assertEqual((24, 0b11, 3), (wave_file.valid_bits_per_sample, wave_file.channel_mask,
+                                             wave_file.sample_width))
+            path = write_wave(os.path.join(directory, 'extensible_float.wav'), 0.01, sample_width=8, is_float=True,
+                              extensible=True)
+            wave_file = WaveFile.from_file(path)
+            self.assertTrue(wave_file.is_float)
+            self.assertEqual(8, wave_file.sample_width)
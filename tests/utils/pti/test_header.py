@@ -1,5 +1,11 @@
 from unittest import TestCase
-from polyend_tracker_pti_creator.utils.pti.header import Header
+from polyend_tracker_pti_creator.utils.exceptions import CreatorInvalidPtiException
+from polyend_tracker_pti_creator.utils.pti.header import (
+    Header,
+    HEADER_FIELDS,
+    HEADER_LENGTH,
+    HEADER_TEMPLATE,
+)
 from polyend_tracker_pti_creator.utils.pti.constants import PTI_HEADER_DEFINITION
 
 
@@ -37,3 +43,33 @@ class TestHeader(TestCase):
             expected = bytearray(header_file.read())
             self.assertEqual(expected, header.data_bytes)
             self.assertNotEquals(header.data_bytes, header_empty.data_bytes)
+
+    def test_template(self) -> None:
+        self.assertEqual(392, HEADER_LENGTH)
+        self.assertEqual(bytearray(HEADER_TEMPLATE), Header({}).data_bytes)
+        offset, field_struct = HEADER_FIELDS['sample_length']
+        data_bytes = Header({'sample_length': 926110}).data_bytes
+        self.assertEqual((926110,), field_struct.unpack_from(data_bytes, offset))
+
+    def test_invalid_field(self) -> None:
+        with self.assertRaises(KeyError):
+            Header({'not_a_field': 1})
+
+    def test_from_bytes(self) -> None:
+        with open('./tests/utils/files/default_header.pti', mode='rb') as header_file:
+            data = header_file.read()
+        header = Header.from_bytes(data)
+        self.assertEqual(data[:392], header.data_bytes)
+        self.assertEqual(data[:392], Header(header.settings).data_bytes)
+        self.assertEqual(926110, header.fields['sample_length'])
+        self.assertEqual(3000, header.fields['panning_env_attack'])
+        self.assertEqual('TI', header.fields['file_type_indicator'])
+        self.assertEqual('test', Header.from_bytes(Header({'instrument_name': 'test'}).data_bytes).fields[
+            'instrument_name'
+        ])
+
+    def test_from_invalid_bytes(self) -> None:
+        with self.assertRaises(CreatorInvalidPtiException):
+            Header.from_bytes(b'TI')
+        with self.assertRaises(CreatorInvalidPtiException):
+            Header.from_bytes(b'RIFF' + bytes(388))
@@ -0,0 +1,53 @@
+import os
+import tempfile
+from unittest import TestCase
+from polyend_tracker_pti_creator.utils.exceptions import CreatorBatchException
+from polyend_tracker_pti_creator.utils.pti.pipeline import Pipeline
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+
+
+class TestPipeline(TestCase):
+    @staticmethod
+    def settings(destination: str, names: list, **settings) -> dict:
+        return {
+            'files': [
+                {
+                    'source_path': './tests/utils/files',
+                    'source_file_name': name,
+                    'source_extension': '.wav',
+                    'destination_path': destination,
+                    'destination_file_name': f'tone_os_{index + 1}',
+                    'destination_extension': '.pti',
+                    'instrument_name': 'test'
+                } for index, name in enumerate(names)
+            ],
+            'mode': 'normal',
+            'playback': 'one-shot',
+            **settings,
+        }
+
+    def test_overlapped_batch(self) -> None:
+        with tempfile.TemporaryDirectory() as destination:
+            Pipeline(PTI(self.settings(destination, ['tone', 'tone2'])), queue_size=1).create()
+            for index in [1, 2]:
+                with open(os.path.join(destination, f'tone_os_{index}.pti'), mode='rb') as file, \
+                        open(f'./tests/utils/files/tone_os_{index}.pti', mode='rb') as expected:
+                    self.assertEqual(expected.read(), file.read())
+
+    def test_native_source(self) -> None:
+        with tempfile.TemporaryDirectory() as destination:
+            settings = self.settings(destination, ['test_tone'])
+            Pipeline(PTI(settings)).create()
+            PTI(self.settings(os.path.join(destination, 'serial'), ['test_tone'])).create()
+            with open(os.path.join(destination, 'tone_os_1.pti'), mode='rb') as file, \
+                    open(os.path.join(destination, 'serial', 'tone_os_1.pti'), mode='rb') as expected:
+                self.assertEqual(expected.read(), file.read())
+
+    def test_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as destination:
+            pti = PTI(self.settings(destination, ['tone', 'missing', 'tone2'], incremental=True))
+            with self.assertRaises(CreatorBatchException) as context:
+                Pipeline(pti).create()
+            self.assertIn('1 of 3 files failed to convert', str(context.exception))
+            self.assertIn('missing.wav', str(context.exception))
+            self.assertEqual(sorted(os.listdir(destination)), ['.pti-manifest.json', 'tone_os_1.pti', 'tone_os_3.pti'])
@@ -1,5 +1,14 @@
+import os
 import struct
+import tempfile
+import wave
 from unittest import TestCase
+from unittest.mock import patch
+from polyend_tracker_pti_creator.utils.discovery import LazySequence
+from polyend_tracker_pti_creator.utils.exceptions import (
+    CreatorBatchException,
+    CreatorSampleTooLongException,
+)
 from polyend_tracker_pti_creator.utils.pti.pti import PTI
 from polyend_tracker_pti_creator.utils.pti.header import Header
 
@@ -74,6 +83,31 @@ class TestPTI(TestCase):
             expected_header_data = header.data
             self.assertEqual(expected_header_data, actual_header_data)
 
+    def test_merge_twice(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            settings = {
+                'files': [
+                    {
+                        'source_path': './tests/utils/files',
+                        'source_file_name': name,
+                        'source_extension': '.wav',
+                        'destination_path': directory,
+                        'destination_file_name': 'kit',
+                        'destination_extension': '.pti',
+                        'instrument_name': 'kit'
+                    } for name in ['tone', 'tone2']
+                ],
+                'mode': 'merge',
+                'playback': 'beat-slice'
+            }
+            outputs = []
+            for _ in range(2):
+                PTI(settings).create()
+                with open(os.path.join(directory, 'kit.pti'), mode='rb') as file:
+                    outputs.append(file.read())
+            self.assertEqual(outputs[0], outputs[1])
+            self.assertNotIn('audio', settings['files'][0])
+
     def test_multi_single_one_shot(self) -> None:
         settings = {
             'files': [
@@ -122,3 +156,128 @@ class TestPTI(TestCase):
             actual_header_data = struct.unpack(header.format, file_content[:392])
             expected_header_data = header.data
             self.assertEqual(expected_header_data, actual_header_data)
+
+    def test_parallel_batch(self) -> None:
+        with tempfile.TemporaryDirectory() as destination:
+            settings = {
+                'files': [
+                    {
+                        'source_path': './tests/utils/files',
+                        'source_file_name': name,
+                        'source_extension': '.wav',
+                        'destination_path': destination,
+                        'destination_file_name': f'tone_os_{index + 1}',
+                        'destination_extension': '.pti',
+                        'instrument_name': 'test'
+                    } for index, name in enumerate(['tone', 'tone2'])
+                ],
+                'mode': 'normal',
+                'playback': 'one-shot',
+                'jobs': 2,
+            }
+            PTI(settings).create()
+            for index in [1, 2]:
+                with open(os.path.join(destination, f'tone_os_{index}.pti'), mode='rb') as file, \
+                        open(f'./tests/utils/files/tone_os_{index}.pti', mode='rb') as expected:
+                    self.assertEqual(expected.read(), file.read())
+
+    def test_parallel_batch_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as destination:
+            settings = {
+                'files': [
+                    {
+                        'source_path': './tests/utils/files',
+                        'source_file_name': name,
+                        'source_extension': '.wav',
+                        'destination_path': destination,
+                        'destination_file_name': name,
+                        'destination_extension': '.pti',
+                        'instrument_name': 'test'
+                    } for name in ['tone', 'missing', 'tone2']
+                ],
+                'mode': 'normal',
+                'playback': 'dynamic',
+                'jobs': 2,
+            }
+            with self.assertRaises(CreatorBatchException) as context:
+                PTI(settings).create()
+            self.assertIn('1 of 3 files failed to convert', str(context.exception))
+            self.assertIn('missing.wav', str(context.exception))
+            self.assertTrue(os.path.exists(os.path.join(destination, 'tone2.pti')))
+
+    def test_decode_on_demand(self) -> None:
+        with tempfile.TemporaryDirectory() as destination:
+            written_before = []
+
+            def files():
+                for index, name in enumerate(['tone', 'tone2']):
+                    written_before.append(sorted(os.listdir(destination)))
+                    yield {
+                        'source_path': './tests/utils/files',
+                        'source_file_name': name,
+                        'source_extension': '.wav',
+                        'destination_path': destination,
+                        'destination_file_name': f'tone_os_{index + 1}',
+                        'destination_extension': '.pti',
+                        'instrument_name': 'test'
+                    }
+
+            settings = {
+                'files': LazySequence(files()),
+                'mode': 'normal',
+                'playback': 'one-shot',
+            }
+            pti = PTI(settings)
+            self.assertEqual(written_before, [])
+            pti.create()
+            self.assertEqual(written_before, [[], ['tone_os_1.pti']])
+            self.assertFalse(any('audio' in file for file in settings['files']))
+
+    @staticmethod
+    def write_silence(path: str, seconds: float) -> None:
+        with wave.open(path, 'wb') as wave_file:
+            wave_file.setnchannels(1)
+            wave_file.setsampwidth(1)
+            wave_file.setframerate(8000)
+            wave_file.writeframes(b'\x80' * int(seconds * 8000))
+
+    def test_too_long_rejected_before_decoding(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_silence(os.path.join(directory, 'long.wav'), 31)
+            self.write_silence(os.path.join(directory, 'half.wav'), 16)
+            file = {
+                'source_path': directory,
+                'source_extension': '.wav',
+                'destination_path': directory,
+                'destination_extension': '.pti',
+                'instrument_name': 'test'
+            }
+            with patch('polyend_tracker_pti_creator.utils.audio.audio.Converter.convert') as convert:
+                with self.assertRaises(CreatorSampleTooLongException) as context:
+                    PTI({
+                        'files': [dict(file, source_file_name='long', destination_file_name='long')],
+                        'mode': 'normal',
+                        'playback': 'dynamic',
+                    }).create()
+                self.assertIn('long.wav is longer than 30 seconds', str(context.exception))
+                with self.assertRaises(CreatorSampleTooLongException):
+                    PTI({
+                        'files': [dict(file, source_file_name='half', destination_file_name='merged')] * 2,
+                        'mode': 'merge',
+                        'playback': 'beat-slice',
+                    })
+                convert.assert_not_called()
+            self.assertEqual(sorted(os.listdir(directory)), ['half.wav', 'long.wav'])
+
+    def test_read(self) -> None:
+        instrument = PTI.read('./tests/utils/files/tone_slice.pti')
+        self.assertEqual('testslice', instrument.instrument_name)
+        self.assertEqual('beat-slice', instrument.playback)
+        self.assertEqual([0, 32768], instrument.slice_points)
+        self.assertEqual(42689, instrument.sample_length)
+        self.assertFalse(hasattr(instrument, '_pcm'))
+        with open('./tests/utils/files/tone_slice.pti', mode='rb') as file:
+            self.assertEqual(file.read()[392:], instrument.pcm.tobytes())
+        instrument = PTI.read('./tests/utils/files/tone.pti')
+        self.assertEqual('forward-loop', instrument.playback)
+        self.assertEqual([13968, 65532], instrument.loop_points)
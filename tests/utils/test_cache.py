@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from polyend_tracker_pti_creator.utils.cache import MANIFEST_FILE_NAME
+from polyend_tracker_pti_creator.utils.exceptions import CreatorSampleTooLongException
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+from tests.corpus import write_wave
+
+
+class TestCache(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        for name in ['tone', 'tone2']:
+            shutil.copy(f'./tests/utils/files/{name}.wav', self.directory)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def settings(self, mode: str = 'normal', instrument_name: str = 'test') -> dict:
+        return {
+            'files': [
+                {
+                    'source_path': self.directory,
+                    'source_file_name': name,
+                    'source_extension': '.wav',
+                    'destination_path': self.directory,
+                    'destination_file_name': name if mode == 'normal' else 'merged',
+                    'destination_extension': '.pti',
+                    'instrument_name': instrument_name
+                } for name in ['tone', 'tone2']
+            ],
+            'mode': mode,
+            'playback': 'dynamic' if mode == 'normal' else 'beat-slice',
+            'incremental': True,
+        }
+
+    def create(self, **kwargs) -> int:
+        pti = PTI(self.settings(**kwargs))
+        pti.create()
+        return pti.skipped
+
+    def test_skips_up_to_date(self) -> None:
+        self.assertEqual(self.create(), 0)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, MANIFEST_FILE_NAME)))
+        self.assertEqual(self.create(), 2)
+
+    def test_changed_source(self) -> None:
+        self.create()
+        with open(os.path.join(self.directory, 'tone2.wav'), mode='ab') as source:
+            source.write(b'\x00\x00\x00\x00')
+        self.assertEqual(self.create(), 1)
+        self.assertEqual(self.create(), 2)
+
+    def test_changed_settings(self) -> None:
+        self.create()
+        self.assertEqual(self.create(instrument_name='other'), 0)
+
+    def test_missing_output(self) -> None:
+        self.create()
+        os.remove(os.path.join(self.directory, 'tone.pti'))
+        self.assertEqual(self.create(), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'tone.pti')))
+
+    def test_merge(self) -> None:
+        self.assertEqual(self.create(mode='merge'), 0)
+        self.assertEqual(self.create(mode='merge'), 1)
+        os.utime(os.path.join(self.directory, 'tone.wav'), ns=(0, 0))
+        self.assertEqual(self.create(mode='merge'), 1)
+
+    def test_failure_in_new_directory(self) -> None:
+        write_wave(os.path.join(self.directory, 'long.wav'), 31)
+        settings = self.settings()
+        settings['files'] = [
+            settings['files'][0],
+            dict(settings['files'][0], source_file_name='long', destination_path=os.path.join(self.directory, 'sub'),
+                 destination_file_name='long'),
+        ]
+        with self.assertRaises(CreatorSampleTooLongException):
+            PTI(settings).create()
+        self.assertTrue(os.path.exists(os.path.join(self.directory, MANIFEST_FILE_NAME)))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'sub')))
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from polyend_tracker_pti_creator.utils.discovery import LazySequence, discover, natural_key
+
+
+class TestDiscovery(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        for path in [
+            'kick 10.wav', 'kick 2.wav', 'notes.txt', 'Snare.WAV',
+            'loops/loop 1.wav', 'loops/old/loop 0.wav', 'loops/loop 1.aif',
+        ]:
+            os.makedirs(os.path.dirname(os.path.join(self.directory, path)), exist_ok=True)
+            with open(os.path.join(self.directory, path), 'wb'):
+                pass
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def relative(self, paths) -> list:
+        return [os.path.relpath(path, self.directory).replace(os.sep, '/') for path in paths]
+
+    def test_natural_key(self) -> None:
+        self.assertEqual(
+            sorted(['kick 10.wav', 'Kick 9.wav', 'tone2.wav', 'tone.wav'], key=natural_key),
+            ['Kick 9.wav', 'kick 10.wav', 'tone.wav', 'tone2.wav'],
+        )
+
+    def test_directory(self) -> None:
+        self.assertEqual(self.relative(discover(self.directory)), ['kick 2.wav', 'kick 10.wav', 'Snare.WAV'])
+
+    def test_recursive(self) -> None:
+        self.assertEqual(self.relative(discover(self.directory, recursive=True)), [
+            'kick 2.wav', 'kick 10.wav', 'loops/loop 1.aif', 'loops/loop 1.wav', 'loops/old/loop 0.wav', 'Snare.WAV',
+        ])
+
+    def test_include_exclude(self) -> None:
+        self.assertEqual(self.relative(discover(self.directory, recursive=True, include=['loops/*'])), [
+            'loops/loop 1.aif', 'loops/loop 1.wav', 'loops/old/loop 0.wav',
+        ])
+        self.assertEqual(self.relative(discover(self.directory, recursive=True, include=['kick*'], exclude=['* 10.*'])),
+                         ['kick 2.wav'])
+        self.assertEqual(self.relative(discover(self.directory, recursive=True, exclude=['old'])), [
+            'kick 2.wav', 'kick 10.wav', 'loops/loop 1.aif', 'loops/loop 1.wav', 'Snare.WAV',
+        ])
+
+    def test_file(self) -> None:
+        path = os.path.join(self.directory, 'kick 2.wav')
+        self.assertEqual(list(discover(path)), [path])
+        self.assertEqual(list(discover(os.path.join(self.directory, 'notes.txt'))), [])
+
+    def test_lazy_sequence(self) -> None:
+        read = []
+
+        def items():
+            for item in range(5):
+                read.append(item)
+                yield item
+
+        sequence = LazySequence(items())
+        self.assertTrue(sequence)
+        self.assertEqual(sequence[1], 1)
+        self.assertEqual(read, [0, 1])
+        self.assertEqual(next(iter(sequence)), 0)
+        self.assertEqual(read, [0, 1])
+        self.assertEqual(len(sequence), 5)
+        self.assertEqual(sequence, [0, 1, 2, 3, 4])
+        self.assertEqual(list(sequence), [0, 1, 2, 3, 4])
+        self.assertFalse(LazySequence([]))
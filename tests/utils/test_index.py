@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from polyend_tracker_pti_creator.utils.index import Index
+from polyend_tracker_pti_creator.utils.pti.header import HEADER_FIELDS
+
+
+class TestIndex(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.library = os.path.join(self.directory, 'library')
+        os.makedirs(os.path.join(self.library, 'kits'))
+        shutil.copy('./tests/utils/files/tone.pti', self.library)
+        shutil.copy('./tests/utils/files/tone_os_1.pti', self.library)
+        shutil.copy('./tests/utils/files/tone_slice.pti', os.path.join(self.library, 'kits'))
+        with open(os.path.join(self.library, 'invalid.pti'), 'wb') as invalid:
+            invalid.write(b'not a pti')
+        self.index = Index(os.path.join(self.directory, 'index.db'))
+
+    def tearDown(self) -> None:
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def paths(self, **filters) -> list:
+        return [os.path.relpath(row['path'], self.library) for row in self.index.query(**filters)]
+
+    def test_update(self) -> None:
+        result = self.index.update(self.library)
+        self.assertEqual((3, 0, 0, 0), result[:4])
+        self.assertEqual([os.path.join(self.library, 'invalid.pti')], result.invalid)
+        self.assertEqual(['kits/tone_slice.pti', 'tone.pti', 'tone_os_1.pti'], self.paths())
+        self.assertEqual((0, 0, 3, 0), self.index.update(self.library)[:4])
+
+        os.utime(os.path.join(self.library, 'tone.pti'), ns=(0, 0))
+        os.remove(os.path.join(self.library, 'tone_os_1.pti'))
+        self.assertEqual((0, 1, 1, 1), self.index.update(self.library)[:4])
+        self.assertEqual(['kits/tone_slice.pti', 'tone.pti'], self.paths())
+
+    def test_query(self) -> None:
+        self.index.update(self.library)
+        row = next(self.index.query(playback='beat-slice'))
+        self.assertEqual('testslice', row['instrument_name'])
+        self.assertEqual(42689, row['sample_length'])
+        self.assertEqual('[0, 32768]', row['slice_points'])
+        self.assertEqual(['kits/tone_slice.pti'], self.paths(min_seconds=0.9))
+        self.assertEqual(['tone.pti', 'tone_os_1.pti'], self.paths(max_seconds=0.9, name='te*'))
+        self.assertEqual([], self.paths(playback='beat-slice', min_seconds=20))
+        row = next(self.index.query(playback='forward-loop'))
+        self.assertEqual((13968, 65532), (row['loop_start'], row['loop_end']))
+        self.assertEqual(['tone.pti'], self.paths(sha256=row['sha256']))
+
+    def test_invalid_slice_count(self) -> None:
+        corrupt = os.path.join(self.library, 'kits', 'corrupt.pti')
+        shutil.copy('./tests/utils/files/tone_slice.pti', corrupt)
+        offset, field_struct = HEADER_FIELDS['number_of_slices']
+        with open(corrupt, 'r+b') as file:
+            file.seek(offset)
+            file.write(field_struct.pack(49))
+        result = self.index.update(self.library)
+        self.assertIn(corrupt, result.invalid)
+        self.assertEqual(['kits/tone_slice.pti', 'tone.pti', 'tone_os_1.pti'], self.paths())
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase
+from polyend_tracker_pti_creator.utils import profiling
+from polyend_tracker_pti_creator.utils.pti.pti import PTI
+
+SOURCES = ['./tests/utils/files/tone.wav', './tests/utils/files/tone2.wav']
+
+
+class TestProfiling(TestCase):
+    def tearDown(self) -> None:
+        profiling.disable()
+
+    def test_disabled(self) -> None:
+        with profiling.stage('parse', 'file'):
+            pass
+        self.assertIsNone(profiling.profiler)
+
+    def test_nested_stages_are_exclusive(self) -> None:
+        profiler = profiling.enable()
+        with profiling.stage('write', 'file'):
+            with profiling.stage('convert', 'file'):
+                time.sleep(0.02)
+        self.assertGreaterEqual(profiler.files['file']['convert'][0], 0.02)
+        self.assertLess(profiler.files['file']['write'][0], 0.01)
+
+    def create(self, destination: str, jobs: int) -> None:
+        PTI({
+            'files': [
+                {
+                    'source_path': os.path.dirname(source),
+                    'source_file_name': os.path.splitext(os.path.basename(source))[0],
+                    'source_extension': '.wav',
+                    'destination_path': destination,
+                    'destination_file_name': str(index),
+                    'destination_extension': '.pti',
+                    'instrument_name': 'test'
+                } for index, source in enumerate(SOURCES)
+            ],
+            'mode': 'normal',
+            'playback': 'dynamic',
+            'jobs': jobs,
+        }).create()
+
+    def test_report(self) -> None:
+        for jobs in [1, 2]:
+            with tempfile.TemporaryDirectory() as destination:
+                profiler = profiling.enable()
+                self.create(destination, jobs)
+                report_path = os.path.join(destination, 'report.json')
+                profiler.save(report_path)
+                with open(report_path, encoding='utf-8') as report_file:
+                    report = json.load(report_file)
+                self.assertEqual(sorted(report['files']), SOURCES)
+                for stages in report['files'].values():
+                    self.assertEqual(sorted(stages), ['convert', 'header', 'parse', 'write'])
+                self.assertEqual(report['stages']['convert']['files'], 2)
+                self.assertIn('convert', profiler.summary())
@@ -0,0 +1,118 @@
+import http.client
+import io
+import threading
+import urllib.error
+import urllib.request
+import zipfile
+from unittest import TestCase
+from polyend_tracker_pti_creator import api
+from polyend_tracker_pti_creator.utils.pti.header import Header
+from polyend_tracker_pti_creator.utils.server import Server
+
+
+class TestServer(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = Server(('127.0.0.1', 0), jobs=1, max_requests=1)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}'
+        cls.tones = {}
+        for name in ['tone', 'tone2']:
+            with open(f'./tests/utils/files/{name}.wav', 'rb') as file:
+                cls.tones[name] = file.read()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+
+    def post(self, query: str, data: bytes, content_type: str = 'audio/wav'):
+        request = urllib.request.Request(
+            f'{self.url}/convert?{query}', data=data, headers={'Content-Type': content_type}
+        )
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.headers, response.read()
+
+    def post_files(self, query: str, names: list):
+        boundary = 'pti-boundary'
+        body = b''
+        for name in names:
+            body += (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{name}.wav"\r\n'
+                f'Content-Type: audio/wav\r\n\r\n'
+            ).encode() + self.tones[name] + b'\r\n'
+        body += f'--{boundary}--\r\n'.encode()
+        return self.post(query, body, f'multipart/form-data; boundary={boundary}')
+
+    def test_convert(self) -> None:
+        headers, content = self.post('instrument-name=test', self.tones['tone'])
+        self.assertEqual('application/octet-stream', headers['Content-Type'])
+        self.assertEqual(api.convert(self.tones['tone'], instrument_name='test'), content)
+
+    def test_batch_zip(self) -> None:
+        headers, content = self.post_files('instrument-name=kit&playback=one-shot', ['tone', 'tone2'])
+        self.assertEqual('application/zip', headers['Content-Type'])
+        with zipfile.ZipFile(io.BytesIO(content)) as zip_file:
+            self.assertEqual(['tone.pti', 'tone2.pti'], zip_file.namelist())
+            headers = [Header.from_bytes(zip_file.read(name)[:392]) for name in zip_file.namelist()]
+        self.assertEqual(['kit1', 'kit2'], [header.fields['instrument_name'] for header in headers])
+
+    def test_merge(self) -> None:
+        headers, content = self.post_files('mode=merge&file-name=kit.pti', ['tone', 'tone2'])
+        self.assertEqual('attachment; filename="kit.pti"', headers['Content-Disposition'])
+        self.assertEqual(api.merge([self.tones['tone'], self.tones['tone2']], instrument_name='kit'), content)
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post('playback=reverse', self.tones['tone'])
+        self.assertEqual(400, context.exception.code)
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post('', b'not a wave file')
+        self.assertEqual(422, context.exception.code)
+
+    def test_unsafe_file_names(self) -> None:
+        for query in ['file-name=x%0d%0aSet-Cookie:%20a=b', 'file-name=a%22b', 'file-name=..%2Fkit']:
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self.post(query, self.tones['tone'])
+            self.assertEqual(400, context.exception.code)
+        body = (
+            b'--pti-boundary\r\nContent-Disposition: form-data; name="file"; filename="../kit.wav"\r\n\r\n'
+            + self.tones['tone'] + b'\r\n--pti-boundary--\r\n'
+        )
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post('', body, 'multipart/form-data; boundary=pti-boundary')
+        self.assertEqual(400, context.exception.code)
+
+    def test_invalid_content_length(self) -> None:
+        for length in ['-1', 'abc']:
+            connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=60)
+            try:
+                connection.putrequest('POST', '/convert')
+                connection.putheader('Content-Length', length)
+                connection.endheaders()
+                response = connection.getresponse()
+                self.assertEqual(400, response.status)
+            finally:
+                connection.close()
+        self.assertTrue(self.server.slots.acquire(blocking=False))
+        self.server.slots.release()
+
+    def test_backpressure(self) -> None:
+        self.server.slots.acquire()
+        try:
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self.post('', self.tones['tone'])
+        finally:
+            self.server.slots.release()
+        self.assertEqual(503, context.exception.code)
+        self.assertEqual('1', context.exception.headers['Retry-After'])
+
+    def test_metrics(self) -> None:
+        self.post('', self.tones['tone'])
+        with urllib.request.urlopen(f'{self.url}/metrics', timeout=60) as response:
+            metrics = response.read().decode()
+        self.assertIn('pti_requests_total{code="200"}', metrics)
+        self.assertIn('pti_requests_in_flight 0', metrics)
+        self.assertIn('pti_workers 1', metrics)
@@ -1,11 +1,16 @@
+import os
+import shutil
+import tempfile
 from unittest import TestCase
-from polyend_tracker_pti_creator.utils.settings import Settings
+from polyend_tracker_pti_creator.utils.settings import Settings, parse_jobs
 from polyend_tracker_pti_creator.utils.exceptions import (
     CreatorSourceMissingException,
     CreatorNoSourceWavFilesException,
     CreatorDestinationInvalidException,
     CreatorModeInvalidException,
     CreatorPlaybackInvalidException,
+    CreatorJobsInvalidException,
+    CreatorResampleQualityInvalidException,
 )
 
 
@@ -17,6 +22,15 @@ class TestObject:
         self.instrument_name = settings['instrument_name'] if 'instrument_name' in settings else None
         self.mode = settings['mode'] if 'mode' in settings else None
         self.playback = settings['playback'] if 'playback' in settings else None
+        self.jobs = settings['jobs'] if 'jobs' in settings else None
+        self.resample_quality = settings['resample_quality'] if 'resample_quality' in settings else None
+        self.incremental = settings['incremental'] if 'incremental' in settings else False
+        self.overlapped = settings['overlapped'] if 'overlapped' in settings else False
+        self.profile = settings['profile'] if 'profile' in settings else None
+        self.recursive = settings['recursive'] if 'recursive' in settings else False
+        self.include = settings['include'] if 'include' in settings else None
+        self.exclude = settings['exclude'] if 'exclude' in settings else None
+        self.ffmpeg = settings['ffmpeg'] if 'ffmpeg' in settings else False
 
 
 class TestSettings(TestCase):
@@ -36,8 +50,8 @@ class TestSettings(TestCase):
         args = TestObject({'source': './'})
         with self.assertRaises(CreatorNoSourceWavFilesException) as context:
             Settings(args)
-            self.assertTrue("Error! No .wav files selected. Currently only .wav files supported. "
-                            "If you're trying to use non-wav files, please convert to .wav then try again."
+            self.assertTrue("Error! No .wav or .aiff files selected. Currently only .wav and .aiff files supported. "
+                            "If you're trying to use other files, please convert to .wav then try again."
                             in context.exception)
 
     def test_invalid_destination(self) -> None:
@@ -57,6 +71,12 @@ class TestSettings(TestCase):
             'instrument_name': 'test',
             'mode': 'merge',
             'playback': None,
+            'jobs': '4',
+            'resample_quality': 'best',
+            'incremental': True,
+            'overlapped': False,
+            'profile': None,
+            'ffmpeg': False,
         })
 
         self.assertEqual(Settings(args).settings, {
@@ -88,8 +108,15 @@ class TestSettings(TestCase):
                     'instrument_name': 'test'
                 }
             ],
+            'destination': './tests/utils/files',
             'mode': 'merge',
-            'playback': 'beat-slice'
+            'playback': 'beat-slice',
+            'jobs': 4,
+            'resample_quality': 'best',
+            'incremental': True,
+            'overlapped': False,
+            'profile': None,
+            'ffmpeg': False,
         })
 
     def test_instrument_name(self) -> None:
@@ -130,8 +157,15 @@ class TestSettings(TestCase):
                     'instrument_name': 'test3'
                 }
             ],
+            'destination': './tests/utils/files',
             'mode': 'normal',
-            'playback': 'dynamic'
+            'playback': 'dynamic',
+            'jobs': os.cpu_count(),
+            'resample_quality': 'fast',
+            'incremental': False,
+            'overlapped': False,
+            'profile': None,
+            'ffmpeg': False,
         })
 
     def test_file_name(self) -> None:
@@ -172,8 +206,15 @@ class TestSettings(TestCase):
                     'instrument_name': 'test3'
                 }
             ],
+            'destination': './tests/utils/files',
             'mode': 'normal',
-            'playback': 'dynamic'
+            'playback': 'dynamic',
+            'jobs': os.cpu_count(),
+            'resample_quality': 'fast',
+            'incremental': False,
+            'overlapped': False,
+            'profile': None,
+            'ffmpeg': False,
         })
 
     def test_invalid_mode(self) -> None:
@@ -205,3 +246,55 @@ class TestSettings(TestCase):
                             "'ping-pong-loop', 'slice', 'beat-slice', 'wavetable', "
                             "'granular', and 'dynamic'" in context.exception
                             )
+
+    def test_invalid_jobs(self) -> None:
+        args = TestObject({
+            'source': './tests/utils/files',
+            'jobs': '0',
+        })
+        with self.assertRaises(CreatorJobsInvalidException) as context:
+            Settings(args)
+            self.assertTrue("Error! Gave an invalid number of jobs. Valid values are whole numbers of 1 or more."
+                            in context.exception)
+
+    def test_parse_jobs(self) -> None:
+        self.assertEqual(4, parse_jobs(4))
+        self.assertEqual(os.cpu_count() or 1, parse_jobs(None))
+        for jobs in [-1, '0', 'many']:
+            with self.assertRaises(CreatorJobsInvalidException):
+                parse_jobs(jobs)
+
+    def test_invalid_resample_quality(self) -> None:
+        args = TestObject({
+            'source': './tests/utils/files',
+            'resample_quality': 'test',
+        })
+        with self.assertRaises(CreatorResampleQualityInvalidException) as context:
+            Settings(args)
+            self.assertTrue("Error! Gave an invalid resample quality. Valid values are 'fast', 'balanced' and 'best'."
+                            in context.exception)
+
+    def test_recursive(self) -> None:
+        source = tempfile.mkdtemp()
+        destination = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(source, 'drums', 'old'))
+            for path in ['lead.wav', 'drums/kick 10.wav', 'drums/kick 2.wav', 'drums/old/kick.wav']:
+                shutil.copy('./tests/utils/files/tone.wav', os.path.join(source, path))
+            args = TestObject({
+                'source': source,
+                'destination': destination,
+                'recursive': True,
+                'exclude': ['old'],
+            })
+            self.assertEqual(
+                [(file['destination_path'], file['destination_file_name']) for file in Settings(args).settings['files']],
+                [
+                    (os.path.join(destination, 'drums'), 'kick 2'),
+                    (os.path.join(destination, 'drums'), 'kick 10'),
+                    (destination, 'lead'),
+                ]
+            )
+        finally:
+            shutil.rmtree(source)
+            shutil.rmtree(destination)
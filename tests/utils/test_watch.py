@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import TestCase, skipUnless
+from polyend_tracker_pti_creator.utils.watch import InotifyWatcher, PollingWatcher, Watcher, bursts, open_watcher
+
+
+def inotify_available() -> bool:
+    try:
+        InotifyWatcher(tempfile.gettempdir()).close()
+    except (OSError, AttributeError):
+        return False
+    return True
+
+
+class TestWatch(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def copy(self, name: str, *subdirectories: str) -> str:
+        directory = os.path.join(self.directory, *subdirectories)
+        os.makedirs(directory, exist_ok=True)
+        return shutil.copy('./tests/utils/files/tone.wav', os.path.join(directory, name))
+
+    def assert_watches(self, watcher: Watcher) -> None:
+        try:
+            self.assertEqual(set(), watcher.changes(0.05))
+            path = self.copy('new.wav')
+            with open(os.path.join(self.directory, 'ignored.pti'), 'wb') as file:
+                file.write(b'pti')
+            self.assertEqual({path}, watcher.changes(5))
+            nested = self.copy('nested.wav', 'drums')
+            changed = set()
+            deadline = time.monotonic() + 5
+            while nested not in changed and time.monotonic() < deadline:
+                changed |= watcher.changes(1)
+            self.assertIn(nested, changed)
+        finally:
+            watcher.close()
+
+    @skipUnless(inotify_available(), 'inotify is not available')
+    def test_inotify(self) -> None:
+        self.assert_watches(InotifyWatcher(self.directory, recursive=True))
+
+    def test_polling(self) -> None:
+        self.assert_watches(PollingWatcher(self.directory, recursive=True, poll_seconds=0.05))
+
+    def test_open_watcher(self) -> None:
+        watcher = open_watcher(self.directory)
+        watcher.close()
+        self.assertIn(watcher.name, ['inotify', 'polling'])
+
+    def test_changes_required(self) -> None:
+        class Incomplete(Watcher):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete(self.directory)  # pylint: disable=abstract-class-instantiated
+
+    def test_bursts(self) -> None:
+        watcher = PollingWatcher(self.directory, poll_seconds=0.05)
+
+        def land() -> None:
+            for index in range(3):
+                self.copy(f'render{index}.wav')
+                time.sleep(0.1)
+
+        writer = threading.Thread(target=land)
+        writer.start()
+        changed = next(bursts(watcher, settle=0.5))
+        writer.join()
+        self.assertEqual(3, len(changed))